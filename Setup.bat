@@ -15,6 +15,12 @@ echo.
 
 pip install -r requirements.txt
 
+echo.
+echo Precomputing dashboard aggregates...
+echo.
+
+python generate_aggregates.py
+
 echo.
 echo ========================================
 echo Setup Complete!
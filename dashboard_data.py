@@ -0,0 +1,342 @@
+"""
+Data loading and page aggregates shared by the dashboard and generate_aggregates.py
+Nothing here depends on Streamlit, so the aggregates can be precomputed offline
+"""
+
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+ACCIDENTS_FILE = 'UK_Accidents_Fully_Cleaned.parquet'
+VEHICLES_FILE = 'UK_Vehicles_Fully_Cleaned.parquet'
+
+# Only the accident columns the pages use are decoded from the parquet file
+ACC_COLS = [
+    'Accident_Index',
+    'Hour',
+    'Day_of_Week',
+    'Month',
+    'Year',
+    'Number_of_Casualties',
+    'Accident_Severity',
+    'Urban_or_Rural_Area',
+    'Local_Authority_(District)',
+    'Junction_Detail',
+    'Junction_Control',
+    'Pedestrian_Crossing-Human_Control',
+    'Pedestrian_Crossing-Physical_Facilities'
+]
+
+# Only these vehicle columns are used by the pages; the rest would just be repeated onto every merged row
+VEH_COLS = ['Accident_Index', 'Age_Band_of_Driver', 'Journey_Purpose_of_Driver']
+
+# Integer columns that fit in 8/16 bits; the nullable Int8 types keep the missing hours and crossing codes
+NARROW_DTYPES = {
+    'Hour': 'Int8',
+    'Month': 'int8',
+    'Year': 'int16',
+    'Number_of_Casualties': 'int16',
+    'Pedestrian_Crossing-Human_Control': 'Int8',
+    'Pedestrian_Crossing-Physical_Facilities': 'Int8'
+}
+
+# Merged frame with the derived columns, saved after the first full load so later server starts read one file
+DERIVED_FILE = 'UK_Merged_Derived.parquet'
+
+# Page aggregates written by generate_aggregates.py, one pickle per entry in AGGREGATES
+AGGREGATES_DIR = 'aggregates'
+
+# Junction_Detail values (lower-cased) that mean the accident was not at a junction
+NOT_AT_JUNCTION = ['not at junction', 'not at junction or within 20 metres', 'data missing or out of range']
+
+# Readable labels for the pedestrian crossing codes; missing or unlisted codes show as 'Unknown'
+PED_HUMAN_CONTROL_LABELS = {
+    0: 'No physical crossing facilities within 50 metres',
+    1: 'Control by school crossing patrol',
+    2: 'Control by other authorised person',
+    4: 'Pedestrian phase at traffic signal junction',
+    5: 'Zebra',
+    -1: 'Data missing or out of range'
+}
+
+PED_PHYSICAL_FACILITIES_LABELS = {
+    0: 'No facilities',
+    1: 'Zebra',
+    4: 'Pelican, puffin, toucan or similar',
+    5: 'Pedestrian phase at traffic signal junction',
+    7: 'Footbridge or subway',
+    8: 'Central refuge',
+    -1: 'Data missing or out of range',
+    9: 'Unknown (self reported)'
+}
+
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Driver age bands counted as middle-aged (26-55), exactly as labelled in the vehicles data
+MIDDLE_AGED_BANDS = ['26 - 35', '36 - 45', '46 - 55']
+
+
+def source_mtime():
+    """Modification time of the newer of the two source datasets"""
+    return max(os.path.getmtime(ACCIDENTS_FILE), os.path.getmtime(VEHICLES_FILE))
+
+
+def junction_indicator(col):
+    """'Yes'/'No' at-junction flag for a junction column; missing values count as 'No'"""
+    col = col.astype('category')
+    # Decide once per category, then expand over the int codes (-1 marks a missing value)
+    not_at_junction = col.cat.categories.str.lower().isin(NOT_AT_JUNCTION)
+    codes = col.cat.codes.to_numpy()
+    is_no = (codes == -1) | not_at_junction[codes]
+    return pd.Categorical.from_codes(is_no.astype('int8'), categories=['Yes', 'No'])
+
+
+def crossing_labels(col, labels):
+    """Pedestrian crossing codes as a categorical Series of their readable labels, in alphabetical order"""
+    col = col.astype('category')
+    names = sorted(set(labels.values()) | {'Unknown'})
+    # Look each code up once per category, then expand over the int codes (-1 marks a missing value)
+    label_codes = np.array([names.index(labels.get(code, 'Unknown')) for code in col.cat.categories] + [names.index('Unknown')])
+    labelled = pd.Categorical.from_codes(label_codes[col.cat.codes.to_numpy()], categories=names)
+    return pd.Series(labelled, index=col.index, name=col.name)
+
+
+def read_batches(path, progress, label, start, span, columns=None):
+    """Read a parquet file batch by batch, reporting progress, and convert it to pandas once"""
+    # String columns other than the join key are low-cardinality labels: have the parquet reader
+    # decode them straight into Arrow dictionaries, which convert to pandas categoricals
+    schema = pq.read_schema(path)
+    dictionary_cols = [
+        field.name for field in schema
+        if pa.types.is_string(field.type) and field.name != 'Accident_Index'
+        and (columns is None or field.name in columns)
+    ]
+    parquet_file = pq.ParquetFile(path, read_dictionary=dictionary_cols)
+    batches = []
+    total_rows = parquet_file.metadata.num_rows
+    # Small batches keep the progress bar moving; they are only Arrow views until the single conversion below
+    chunk_size = 65536
+
+    # Each progress call is a round trip to the browser, so report at most every 5% of the file
+    last_step = -1
+    for i, batch in enumerate(parquet_file.iter_batches(batch_size=chunk_size, columns=columns)):
+        batches.append(batch)
+        rows_read = min((i+1)*chunk_size, total_rows)
+        step = rows_read * 20 // total_rows
+        if step != last_step:
+            last_step = step
+            progress(start + rows_read / total_rows * span, f"Loading {label}... {rows_read:,} / {total_rows:,} rows")
+
+    # Convert once from Arrow instead of converting every batch and concatenating the pandas chunks;
+    # self_destruct frees the Arrow buffers column by column as they are converted, and the pool is
+    # asked to hand that memory back before the next file is read
+    table = pa.Table.from_batches(batches)
+    batches.clear()
+    df = table.to_pandas(self_destruct=True)
+    del table
+    pa.default_memory_pool().release_unused()
+
+    # Dictionary order follows first appearance; sort it so category order (and sort_index) stays alphabetical
+    for col in dictionary_cols:
+        df[col] = df[col].cat.reorder_categories(sorted(df[col].cat.categories))
+    return df
+
+
+def load_merged(progress=None):
+    """Accidents merged with their vehicles plus the derived columns, read from the sidecar when it is current"""
+    if progress is None:
+        progress = lambda fraction, message: None
+
+    # Reuse the prepared frame if it is newer than both source files
+    if os.path.exists(DERIVED_FILE) and os.path.getmtime(DERIVED_FILE) >= source_mtime():
+        return pd.read_parquet(DERIVED_FILE)
+
+    # Load accidents data
+    df_accidents = read_batches(ACCIDENTS_FILE, progress, 'accidents', 0, 0.5, columns=ACC_COLS)
+
+    # Narrow the small integer columns before the merge repeats them per vehicle
+    df_accidents = df_accidents.astype(NARROW_DTYPES)
+
+    # Load vehicles data
+    df_vehicles = read_batches(VEHICLES_FILE, progress, 'vehicles', 0.5, 0.4, columns=VEH_COLS)
+
+    # Give both sides the same categorical key: the accident ids are the categories (accident i is code i)
+    # and each vehicle's id is looked up once against them, so the merge hashes int codes instead of strings.
+    # Vehicles whose accident isn't in the accidents file get a missing key and never match, as before.
+    progress(0.9, "Merging datasets...")
+    accident_ids = pd.Index(df_accidents['Accident_Index'])
+    key_dtype = pd.CategoricalDtype(accident_ids)
+    df_accidents['Accident_Index'] = pd.Categorical.from_codes(np.arange(len(accident_ids)), dtype=key_dtype)
+    df_vehicles['Accident_Index'] = pd.Categorical.from_codes(
+        accident_ids.get_indexer(df_vehicles['Accident_Index']), dtype=key_dtype)
+
+    # Merge accidents (left) with vehicles to preserve all accidents
+    # One row per vehicle involved is kept on purpose: the driver age/journey charts count drivers, and
+    # the combined filters on the Comprehensive page mix driver and accident fields on the same row
+    df = df_accidents.merge(df_vehicles, on='Accident_Index', how='left', suffixes=('', '_vehicle'),
+                            validate='one_to_many', sort=False)
+    # No page reads the id itself, and as a 2M-value categorical it would dominate the sidecar file
+    df = df.drop(columns='Accident_Index')
+
+    # Add derived columns
+    progress(0.95, "Adding derived columns...")
+    # Both columns are bucketed with lookups over whole arrays and built straight as categoricals
+    # Time period: Night before 06:00 and from 22:00, Morning 06-12, Afternoon 12-18, Evening 18-22
+    hour = df['Hour'].to_numpy(dtype='float64', na_value=np.nan)
+    period_codes = np.array([0, 1, 2, 3, 0], dtype='int8')[np.searchsorted([6, 12, 18, 22], hour, side='right')]
+    period_codes[np.isnan(hour)] = 4
+    df['Time_Period'] = pd.Categorical.from_codes(
+        period_codes, categories=['Night', 'Morning', 'Afternoon', 'Evening', 'Unknown'])
+
+    # Season by month number (index 0 is unused)
+    season_codes = np.array([3, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0], dtype='int8')
+    df['Season'] = pd.Categorical.from_codes(
+        season_codes[df['Month'].to_numpy()], categories=['Winter', 'Spring', 'Summer', 'Autumn'])
+
+    # Junction flag used to split the Junction page into junction / non-junction accidents
+    df['At_Junction'] = junction_indicator(df['Junction_Detail'])
+
+    # Save the prepared frame for the next cold start; categories survive the round trip. It is written to a
+    # temporary file and renamed into place, so an interrupted write never leaves a partial file that looks fresh.
+    progress(0.98, "Saving prepared data...")
+    tmp_path = f"{DERIVED_FILE}.{os.getpid()}.tmp"
+    try:
+        df.to_parquet(tmp_path, compression='zstd', row_group_size=131072, index=False)
+        os.replace(tmp_path, DERIVED_FILE)
+    except OSError as e:
+        logging.getLogger(__name__).warning("Could not save %s: %s", DERIVED_FILE, e)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    progress(1.0, "Done")
+    return df
+
+
+def dataset_summary(df):
+    """Row count, year range, casualty total and fatal count for the sidebar and introduction"""
+    return {
+        'rows': len(df),
+        'first_year': int(df['Year'].min()),
+        'last_year': int(df['Year'].max()),
+        'casualties': int(df['Number_of_Casualties'].sum()),
+        'fatal': int((df['Accident_Severity'] == 'Fatal').sum())
+    }
+
+
+def hourly_counts(df):
+    """Accidents per hour of day"""
+    return df['Hour'].value_counts().sort_index()
+
+
+def hour_day_counts(df):
+    """Hour x day-of-week accident counts, days Monday to Sunday"""
+    return df.groupby(['Hour', 'Day_of_Week'], observed=True).size().unstack(fill_value=0)[DAY_ORDER]
+
+
+def day_type_counts(df):
+    """Accidents on weekdays and at weekends"""
+    weekend = int(df['Day_of_Week'].isin(['Saturday', 'Sunday']).sum())
+    return pd.Series({'Weekday': len(df) - weekend, 'Weekend': weekend})
+
+
+def time_period_counts(df):
+    """Accidents per time period"""
+    return df['Time_Period'].value_counts()
+
+
+def age_band_counts(df):
+    """Accidents per driver age band"""
+    return df['Age_Band_of_Driver'].value_counts().sort_index()
+
+
+def journey_purpose_counts(df):
+    """The ten most common journey purposes"""
+    return df['Journey_Purpose_of_Driver'].value_counts().head(10)
+
+
+def area_severity_counts(df):
+    """Accident counts with area type as rows and severity as columns"""
+    return df.groupby(['Urban_or_Rural_Area', 'Accident_Severity'], observed=True).size().unstack(fill_value=0)
+
+
+def authority_counts(df):
+    """Accident counts per area type and local authority"""
+    return df.groupby(['Urban_or_Rural_Area', 'Local_Authority_(District)'], observed=True).size()
+
+
+def junction_breakdown(df):
+    """Accident counts per junction flag, junction detail/control and labelled pedestrian crossing type"""
+    # Missing junction values are kept as their own group; the crossing codes are labelled first
+    return df.groupby(
+        [df['At_Junction'], df['Junction_Detail'], df['Junction_Control'],
+         crossing_labels(df['Pedestrian_Crossing-Human_Control'], PED_HUMAN_CONTROL_LABELS),
+         crossing_labels(df['Pedestrian_Crossing-Physical_Facilities'], PED_PHYSICAL_FACILITIES_LABELS)],
+        observed=True, dropna=False
+    ).size()
+
+
+def comprehensive_stats(df):
+    """Headline percentages and the perfect storm count for the Comprehensive Analysis page"""
+    rows = len(df)
+    # Each predicate is evaluated once as a plain bool array (missing values are False) and the
+    # perfect storm is their AND, counted without materializing the matching rows
+    rush_hour = df['Hour'].isin([8, 9, 17, 18]).to_numpy()
+    # isin on the categorical compares category codes, not every row's string
+    middle_aged = df['Age_Band_of_Driver'].isin(MIDDLE_AGED_BANDS).to_numpy()
+    # Area type is compared on its int codes; -1 marks a missing area type
+    area = df['Urban_or_Rural_Area']
+    area_codes = area.cat.codes.to_numpy()
+    urban = area_codes == area.cat.categories.get_loc('Urban')
+    weekday = ~df['Day_of_Week'].isin(['Saturday', 'Sunday']).to_numpy()
+    perfect_storm = int(np.logical_and.reduce([rush_hour, middle_aged, urban, weekday]).sum())
+    urban_count = urban.sum()
+    known_area_count = np.count_nonzero(area_codes != -1)
+    return {
+        'peak_hour': int(df['Hour'].value_counts().idxmax()),
+        'peak_day': df['Day_of_Week'].value_counts().idxmax(),
+        'rush_hour_pct': rush_hour.sum() / rows * 100,
+        'middle_aged_pct': middle_aged.sum() / rows * 100,
+        'urban_pct': urban_count / rows * 100,
+        # Share of the accidents with a known area type
+        'urban_known_pct': urban_count / known_area_count * 100,
+        'weekday_pct': weekday.sum() / rows * 100,
+        'perfect_storm': perfect_storm,
+        'perfect_storm_pct': perfect_storm / rows * 100
+    }
+
+
+# Every precomputable page aggregate, by the name it is saved under in AGGREGATES_DIR
+AGGREGATES = {
+    'dataset_summary': dataset_summary,
+    'hourly_counts': hourly_counts,
+    'hour_day_counts': hour_day_counts,
+    'day_type_counts': day_type_counts,
+    'time_period_counts': time_period_counts,
+    'age_band_counts': age_band_counts,
+    'journey_purpose_counts': journey_purpose_counts,
+    'area_severity_counts': area_severity_counts,
+    'authority_counts': authority_counts,
+    'junction_breakdown': junction_breakdown,
+    'comprehensive_stats': comprehensive_stats
+}
+
+
+def aggregate_path(name):
+    return os.path.join(AGGREGATES_DIR, f'{name}.pkl')
+
+
+def read_aggregate(name):
+    """The saved aggregate, or None if it is missing or older than the source data"""
+    path = aggregate_path(name)
+    if os.path.exists(path) and os.path.getmtime(path) >= source_mtime():
+        return pd.read_pickle(path)
+    return None
+
+
+def write_aggregate(name, result):
+    os.makedirs(AGGREGATES_DIR, exist_ok=True)
+    pd.to_pickle(result, aggregate_path(name))
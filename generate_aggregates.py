@@ -0,0 +1,18 @@
+"""
+Precompute the dashboard's page aggregates so the pages don't scan the full dataset at runtime
+Run this script once, and again whenever the datasets change, to fill the aggregates/ folder
+"""
+
+from dashboard_data import AGGREGATES, aggregate_path, load_merged, write_aggregate
+
+print("Loading data...")
+df = load_merged()
+print(f"Loaded {len(df):,} rows")
+
+print(f"\nWriting {len(AGGREGATES)} aggregates...")
+for name, compute in AGGREGATES.items():
+    write_aggregate(name, compute(df))
+    print(f"✓ Saved: {aggregate_path(name)}")
+
+print("\n✅ All aggregates generated successfully!")
+print("The dashboard loads them from 'aggregates/' instead of computing them from the full data.")
@@ -3,28 +3,199 @@ Generate static map visualizations to avoid runtime plotting
 Run this script once to create the map HTML files
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 
-print("Loading data...")
-df = pd.read_parquet('UK_Accidents_Fully_Cleaned.parquet')
+DATA_FILE = 'UK_Accidents_Fully_Cleaned.parquet'
 
-print(f"Loaded {len(df):,} rows")
+# Aggregates are cached here between runs so restyling a chart doesn't redo the full-data passes
+CACHE_DIR = os.path.join('maps', '_cache')
 
-# Create maps directory if it doesn't exist
-import os
-os.makedirs('maps', exist_ok=True)
+# Only the columns used by the maps/charts below are read from the parquet file
+COLS = [
+    'Latitude',
+    'Longitude',
+    'Local_Authority_(District)',
+    'Urban_or_Rural_Area',
+    'Accident_Severity',
+    'Number_of_Casualties'
+]
+
+
+@lru_cache(maxsize=None)
+def load_table():
+    """Read the accidents data as an Arrow table, only called when an aggregate is missing from the cache"""
+    print("Loading data...")
+    table = pq.read_table(DATA_FILE, columns=COLS, use_threads=True)
+
+    print(f"Loaded {table.num_rows:,} rows")
+    return table
+
+
+@lru_cache(maxsize=None)
+def load_data():
+    """pandas view of the columns the casualty statistics need; everything else is aggregated on the Arrow table"""
+    table = load_table().select(['Urban_or_Rural_Area', 'Number_of_Casualties'])
+
+    # Area type is compared against to build the row masks, so dictionary-encode it in Arrow and let it
+    # convert straight to a pandas category instead of going through object strings
+    table = table.set_column(0, 'Urban_or_Rural_Area', pc.dictionary_encode(table['Urban_or_Rural_Area']))
+
+    # Plain numpy-backed columns (no ArrowDtype). The selected columns share their buffers with the cached
+    # full table, so converting them frees nothing and the table is left intact for the other aggregates
+    df = table.to_pandas(split_blocks=True)
+
+    # Casualty counts fit in a byte
+    df['Number_of_Casualties'] = df['Number_of_Casualties'].astype('uint8')
+
+    return df
+
+
+@lru_cache(maxsize=None)
+def area_masks():
+    """Urban and rural row masks, computed once and reused by the charts below"""
+    area = load_data()['Urban_or_Rural_Area']
+    return (area == 'Urban').to_numpy(), (area == 'Rural').to_numpy()
+
+
+def cached(name, compute):
+    """Return the frame cached as maps/_cache/<name>.feather, computing it if missing or older than the data"""
+    path = os.path.join(CACHE_DIR, f'{name}.feather')
+    if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(DATA_FILE):
+        return pd.read_feather(path)
+
+    table = compute()
+    table.to_feather(path)
+    return table
+
+
+def write_figure(path, fig):
+    fig.write_html(path, include_plotlyjs='cdn')
+    return path
+
+
+def density_cells():
+    # Bin every accident on a 0.05 degree grid so the map gets exact counts per cell instead of raw points
+    table = load_table()
+    counts, lat_edges, lon_edges = np.histogram2d(
+        table['Latitude'].to_numpy(),
+        table['Longitude'].to_numpy(),
+        bins=[np.arange(49, 61, 0.05), np.arange(-8, 2, 0.05)]
+    )
+    ii, jj = np.nonzero(counts)
+    return pd.DataFrame({
+        'Latitude': ((lat_edges[ii] + lat_edges[ii + 1]) / 2).round(3),
+        'Longitude': ((lon_edges[jj] + lon_edges[jj + 1]) / 2).round(3),
+        'Accidents': counts[ii, jj].astype('int64')
+    })
+
+
+def authority_summary():
+    table = load_table()
+
+    # Aggregate per authority directly on the Arrow table; only the few hundred result rows reach pandas
+    area = table['Urban_or_Rural_Area']
+    table = table.append_column('Urban', pc.cast(pc.equal(area, 'Urban'), pa.int64()))
+    table = table.append_column('Rural', pc.cast(pc.equal(area, 'Rural'), pa.int64()))
+
+    # Coordinates are summed and divided by the shared row count rather than each keeping its own mean count
+    summary = table.group_by('Local_Authority_(District)').aggregate([
+        ('Latitude', 'sum'),
+        ('Longitude', 'sum'),
+        ([], 'count_all'),
+        ('Urban', 'sum'),
+        ('Rural', 'sum')
+    ]).sort_by('Local_Authority_(District)').to_pandas()
+
+    summary = summary.rename(columns={
+        'count_all': 'Total',
+        'Urban_sum': 'Urban',
+        'Rural_sum': 'Rural'
+    })
+    summary['Latitude'] = summary['Latitude_sum'] / summary['Total']
+    summary['Longitude'] = summary['Longitude_sum'] / summary['Total']
+    # 'Unallocated' rows only count towards Total; an even urban/rural split is marked Rural
+    summary['Predominant_Type'] = np.where(summary['Urban'] > summary['Rural'], 'Urban', 'Rural')
+
+    return summary[['Local_Authority_(District)', 'Latitude', 'Longitude', 'Predominant_Type', 'Total', 'Urban', 'Rural']]
+
+
+def severity_by_area():
+    # One Arrow group_by pass yields the area totals and both severity distributions
+    counts = load_table().group_by(['Urban_or_Rural_Area', 'Accident_Severity']).aggregate([
+        ([], 'count_all')
+    ]).to_pandas()
+
+    sev_xtab = counts.pivot(index='Urban_or_Rural_Area', columns='Accident_Severity', values='count_all')
+    sev_xtab = sev_xtab.fillna(0).astype('int64').rename_axis(columns=None)
+    return sev_xtab.reset_index()
+
+
+def casualty_stats(mask):
+    # Box plot statistics over every row in the area, so the chart ships a handful of numbers instead of raw values
+    values = load_data()['Number_of_Casualties'].to_numpy()[mask]
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    lo, hi = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    inside = values[(values >= lo) & (values <= hi)]
+    return pd.DataFrame({
+        'q1': [q1],
+        'median': [median],
+        'q3': [q3],
+        'lowerfence': [inside.min()],
+        'upperfence': [inside.max()],
+        # Casualty counts are small integers, so the distinct outlier values are enough to draw the points
+        'outliers': [np.unique(values[(values < lo) | (values > hi)])]
+    })
+
+
+def casualty_box(stats, name, color):
+    """Precomputed box trace plus its outlier points, both on the x position given by name"""
+    row = stats.iloc[0]
+    box = go.Box(
+        name=name,
+        x=[name],
+        q1=[row['q1']],
+        median=[row['median']],
+        q3=[row['q3']],
+        lowerfence=[row['lowerfence']],
+        upperfence=[row['upperfence']],
+        boxpoints=False,
+        marker_color=color
+    )
+    outliers = go.Scatter(
+        x=[name] * len(row['outliers']),
+        y=row['outliers'],
+        mode='markers',
+        marker_color=color,
+        showlegend=False
+    )
+    return box, outliers
+
+
+# Create maps directory (and the aggregate cache) if it doesn't exist
+os.makedirs(CACHE_DIR, exist_ok=True)
+
+# (path, figure) pairs, written out concurrently once every figure is built
+figures = []
 
 # ============ MAP 1: Density Heatmap ============
 print("\nGenerating density heatmap...")
-sample_df = df.sample(n=min(20000, len(df)), random_state=42)
+density_df = cached('density_cells', density_cells)
 
 fig1 = px.density_mapbox(
-    sample_df,
+    density_df,
     lat='Latitude',
     lon='Longitude',
+    z='Accidents',
     radius=8,
     center=dict(lat=54.5, lon=-3.5),
     zoom=5,
@@ -33,31 +204,11 @@ fig1 = px.density_mapbox(
     height=700
 )
 
-fig1.write_html('maps/density_heatmap.html')
-print("✓ Saved: maps/density_heatmap.html")
+figures.append(('maps/density_heatmap.html', fig1))
 
 # ============ MAP 2: Urban vs Rural Map ============
 print("\nGenerating urban vs rural map...")
-
-# Calculate predominant area type for each local authority
-authority_summary = df.groupby('Local_Authority_(District)').agg({
-    'Urban_or_Rural_Area': lambda x: x.value_counts().index[0] if len(x) > 0 else 'Unknown',
-    'Latitude': 'mean',
-    'Longitude': 'mean'
-}).reset_index()
-
-authority_summary.columns = ['Local_Authority_(District)', 'Predominant_Type', 'Latitude', 'Longitude']
-
-# Add total count
-authority_summary['Total'] = df.groupby('Local_Authority_(District)').size().values
-
-# Split into urban and rural
-urban_data = df[df['Urban_or_Rural_Area'] == 'Urban'].groupby('Local_Authority_(District)').size().reset_index(name='Urban')
-rural_data = df[df['Urban_or_Rural_Area'] == 'Rural'].groupby('Local_Authority_(District)').size().reset_index(name='Rural')
-
-authority_map_data = authority_summary.merge(urban_data, on='Local_Authority_(District)', how='left')
-authority_map_data = authority_map_data.merge(rural_data, on='Local_Authority_(District)', how='left')
-authority_map_data = authority_map_data.fillna(0)
+authority_map_data = cached('authority_map_data', authority_summary)
 
 fig2 = px.scatter_mapbox(
     authority_map_data,
@@ -94,21 +245,20 @@ fig2.update_layout(
     )
 )
 
-fig2.write_html('maps/urban_vs_rural_map.html')
-print("✓ Saved: maps/urban_vs_rural_map.html")
+figures.append(('maps/urban_vs_rural_map.html', fig2))
 
 # ============ MAP 3-6: Urban vs Rural Detailed Comparison (Split into 4 charts) ============
 print("\nGenerating urban vs rural detailed comparison charts (4 separate files)...")
+sev_xtab = cached('severity_by_area', severity_by_area).set_index('Urban_or_Rural_Area')
 
 # Chart 1: Accident Count by Area Type
 print("  - Chart 1: Accident Count...")
-area_counts = df['Urban_or_Rural_Area'].value_counts()
+area_counts = sev_xtab.sum(axis=1).sort_values(ascending=False)
 fig3 = go.Figure(data=[
-    go.Bar(x=area_counts.index, y=area_counts.values, 
+    go.Bar(x=area_counts.index, y=area_counts.values,
            marker_color=['#FF6B6B', '#4ECDC4'],
-           text=area_counts.values,
            textposition='auto',
-           texttemplate='%{text:,.0f}')
+           texttemplate='%{y:,.0f}')
 ])
 fig3.update_layout(
     title='Accident Count by Area Type',
@@ -117,12 +267,11 @@ fig3.update_layout(
     height=400,
     showlegend=False
 )
-fig3.write_html('maps/urban_rural_chart1_count.html')
-print("✓ Saved: maps/urban_rural_chart1_count.html")
+figures.append(('maps/urban_rural_chart1_count.html', fig3))
 
 # Chart 2: Urban Severity Distribution
 print("  - Chart 2: Urban Severity Distribution...")
-urban_severity = df[df['Urban_or_Rural_Area'] == 'Urban']['Accident_Severity'].value_counts()
+urban_severity = sev_xtab.loc['Urban'].sort_values(ascending=False)
 fig4 = go.Figure(data=[
     go.Pie(labels=urban_severity.index, values=urban_severity.values,
            marker_colors=['lightcoral', 'orange', 'darkred'],
@@ -134,12 +283,11 @@ fig4.update_layout(
     title='Severity Distribution in Urban Areas',
     height=400
 )
-fig4.write_html('maps/urban_rural_chart2_urban_severity.html')
-print("✓ Saved: maps/urban_rural_chart2_urban_severity.html")
+figures.append(('maps/urban_rural_chart2_urban_severity.html', fig4))
 
 # Chart 3: Rural Severity Distribution
 print("  - Chart 3: Rural Severity Distribution...")
-rural_severity = df[df['Urban_or_Rural_Area'] == 'Rural']['Accident_Severity'].value_counts()
+rural_severity = sev_xtab.loc['Rural'].sort_values(ascending=False)
 fig5 = go.Figure(data=[
     go.Pie(labels=rural_severity.index, values=rural_severity.values,
            marker_colors=['lightblue', 'orange', 'darkred'],
@@ -151,31 +299,29 @@ fig5.update_layout(
     title='Severity Distribution in Rural Areas',
     height=400
 )
-fig5.write_html('maps/urban_rural_chart3_rural_severity.html')
-print("✓ Saved: maps/urban_rural_chart3_rural_severity.html")
-
-# Chart 4: Casualties Comparison (sampled for performance)
-print("  - Chart 4: Casualties Comparison (sampling for optimization)...")
-urban_sample = df[df['Urban_or_Rural_Area'] == 'Urban']['Number_of_Casualties'].sample(
-    n=min(50000, len(df[df['Urban_or_Rural_Area'] == 'Urban'])), 
-    random_state=42
-)
-rural_sample = df[df['Urban_or_Rural_Area'] == 'Rural']['Number_of_Casualties'].sample(
-    n=min(50000, len(df[df['Urban_or_Rural_Area'] == 'Rural'])), 
-    random_state=42
-)
+figures.append(('maps/urban_rural_chart3_rural_severity.html', fig5))
+
+# Chart 4: Casualties Comparison (precomputed box statistics)
+print("  - Chart 4: Casualties Comparison (precomputing box statistics)...")
+urban_stats = cached('urban_casualty_stats', lambda: casualty_stats(area_masks()[0]))
+rural_stats = cached('rural_casualty_stats', lambda: casualty_stats(area_masks()[1]))
 
 fig6 = go.Figure()
-fig6.add_trace(go.Box(y=urban_sample, name='Urban', marker_color='#FF6B6B'))
-fig6.add_trace(go.Box(y=rural_sample, name='Rural', marker_color='#4ECDC4'))
+fig6.add_traces(casualty_box(urban_stats, 'Urban', '#FF6B6B'))
+fig6.add_traces(casualty_box(rural_stats, 'Rural', '#4ECDC4'))
 fig6.update_layout(
     title='Casualties Comparison: Urban vs Rural',
     yaxis_title='Number of Casualties',
     height=400,
     showlegend=True
 )
-fig6.write_html('maps/urban_rural_chart4_casualties.html')
-print("✓ Saved: maps/urban_rural_chart4_casualties.html")
+figures.append(('maps/urban_rural_chart4_casualties.html', fig6))
+
+# ============ Write all HTML files ============
+print(f"\nWriting {len(figures)} HTML files...")
+with ThreadPoolExecutor(max_workers=len(figures)) as pool:
+    for path in pool.map(lambda item: write_figure(*item), figures):
+        print(f"✓ Saved: {path}")
 
 print("\n✅ All maps generated successfully!")
 print("Maps saved in 'maps/' folder and can be loaded instantly in the dashboard.")
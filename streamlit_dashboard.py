@@ -1,5 +1,4 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
@@ -8,9 +7,12 @@ import seaborn as sns
 import matplotlib.pyplot as plt
 from io import BytesIO
 import os
+from string import Template
 import warnings
 warnings.filterwarnings('ignore')
 
+from dashboard_data import AGGREGATES, aggregate_path, load_merged, read_aggregate, source_mtime
+
 # Page configuration
 st.set_page_config(
     page_title="UK Road Accidents Analysis Dashboard",
@@ -71,83 +73,21 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Cache data loading
-@st.cache_data
+# cache_resource keeps one shared frame for every session instead of pickling a copy per access;
+# pages must treat it as read-only (derived columns belong in dashboard_data.load_merged)
+@st.cache_resource(show_spinner=False)
 def load_data():
     try:
-        import pyarrow.parquet as pq
-        
-        # Load accidents data
         status_text = st.empty()
         progress_bar = st.progress(0)
         
-        status_text.text("Loading accidents data...")
-        accidents_file = pq.ParquetFile('UK_Accidents_Fully_Cleaned.parquet')
-        accidents_chunks = []
-        total_rows = accidents_file.metadata.num_rows
-        chunk_size = 500000
-        
-        for i, batch in enumerate(accidents_file.iter_batches(batch_size=chunk_size)):
-            status_text.text(f"Loading accidents... {min((i+1)*chunk_size, total_rows):,} / {total_rows:,} rows")
-            chunk_df = batch.to_pandas()
-            accidents_chunks.append(chunk_df)
-            progress_bar.progress(min((i+1)*chunk_size / total_rows * 0.5, 0.5))
-        
-        df_accidents = pd.concat(accidents_chunks, ignore_index=True)
-        
-        # Load vehicles data
-        status_text.text("Loading vehicles data...")
-        vehicles_file = pq.ParquetFile('UK_Vehicles_Fully_Cleaned.parquet')
-        vehicles_chunks = []
-        total_rows = vehicles_file.metadata.num_rows
-        
-        for i, batch in enumerate(vehicles_file.iter_batches(batch_size=chunk_size)):
-            status_text.text(f"Loading vehicles... {min((i+1)*chunk_size, total_rows):,} / {total_rows:,} rows")
-            chunk_df = batch.to_pandas()
-            vehicles_chunks.append(chunk_df)
-            progress_bar.progress(0.5 + min((i+1)*chunk_size / total_rows * 0.4, 0.4))
-        
-        df_vehicles = pd.concat(vehicles_chunks, ignore_index=True)
+        def show_progress(fraction, message):
+            status_text.text(message)
+            progress_bar.progress(fraction)
         
-        # Merge accidents (left) with vehicles to preserve all accidents
-        status_text.text("Merging datasets...")
-        df = df_accidents.merge(df_vehicles, on='Accident_Index', how='left', suffixes=('', '_vehicle'))
-        progress_bar.progress(0.95)
+        df = load_merged(show_progress)
         
-        # Convert string columns to category to save memory
-        status_text.text("Optimizing memory usage...")
-        string_cols = df.select_dtypes(include=['object', 'string']).columns
-        for col in string_cols:
-            if df[col].nunique() / len(df) < 0.5:
-                df[col] = df[col].astype('category')
-        
-        # Add derived columns
-        status_text.text("Adding derived columns...")
-        def get_time_period(hour):
-            if pd.isna(hour):
-                return 'Unknown'
-            if 6 <= hour < 12:
-                return 'Morning'
-            elif 12 <= hour < 18:
-                return 'Afternoon'
-            elif 18 <= hour < 22:
-                return 'Evening'
-            else:
-                return 'Night'
-        
-        def get_season(month):
-            if month in [12, 1, 2]:
-                return 'Winter'
-            elif month in [3, 4, 5]:
-                return 'Spring'
-            elif month in [6, 7, 8]:
-                return 'Summer'
-            else:
-                return 'Autumn'
-        
-        df['Time_Period'] = df['Hour'].apply(get_time_period)
-        df['Season'] = df['Month'].apply(get_season)
-        
-        progress_bar.progress(1.0)
+        progress_bar.empty()
         status_text.empty()
         
         return df
@@ -155,195 +95,162 @@ def load_data():
         st.error(f"Error loading data: {str(e)}")
         return None
 
-# Check if files exist, otherwise show uploader
-import os
-
-if not os.path.exists('UK_Accidents_Fully_Cleaned.parquet') or not os.path.exists('UK_Vehicles_Fully_Cleaned.parquet'):
-    st.title("📁 Upload Data Files")
-    st.info("Please upload both UK_Accidents_Fully_Cleaned.parquet and UK_Vehicles_Fully_Cleaned.parquet files to continue.")
-    
-    accidents_file = st.file_uploader("Upload Accidents Parquet File", type=['parquet'], key='accidents')
-    vehicles_file = st.file_uploader("Upload Vehicles Parquet File", type=['parquet'], key='vehicles')
+def get_data():
+    """The full merged frame, loading it on first use; stops the page if it can't be loaded"""
+    with st.spinner('Loading and merging data in chunks... This may take a moment.'):
+        df = load_data()
     
-    if accidents_file is not None and vehicles_file is not None:
-        with open('UK_Accidents_Fully_Cleaned.parquet', 'wb') as f:
-            f.write(accidents_file.getvalue())
-        with open('UK_Vehicles_Fully_Cleaned.parquet', 'wb') as f:
-            f.write(vehicles_file.getvalue())
-        st.success("Files uploaded successfully! Reloading...")
-        st.rerun()
-    else:
+    if df is None:
+        st.error("Failed to load data. Please check the files and try again.")
         st.stop()
+    return df
 
-# Load data
-with st.spinner('Loading and merging data in chunks... This may take a moment.'):
-    df = load_data()
-    
-if df is None:
-    st.error("Failed to load data. Please check the files and try again.")
-    st.stop()
+# Page aggregates come from aggregates/ when generate_aggregates.py has been run, so those pages never
+# scan the full frame; otherwise they are computed once from it.
+# - The pickle read is cached per (file mtime, source mtime), so a regenerated pickle or newer source data
+#   is picked up on the next rerun; a missing file is checked again on every call and never cached.
+# - The fallback computation is cached per name for the life of the shared frame. Loading that frame shows
+#   a spinner and progress bar and may stop the page, so get_data() is called outside any cached function.
+@st.cache_data(show_spinner=False)
+def saved_aggregate(name, saved_mtime, data_mtime):
+    """The aggregate saved by generate_aggregates.py, or None if it is older than the source data"""
+    return read_aggregate(name)
 
-# Sidebar
-st.sidebar.title("Dashboard Navigation")
-st.sidebar.markdown("---")
+@st.cache_data(show_spinner=False)
+def compute_aggregate(name, _df):
+    """A named aggregate computed from the full frame; _df is the shared frame and isn't hashed"""
+    return AGGREGATES[name](_df)
 
-page = st.sidebar.radio(
-    "Select Analysis View:",
-    ["Introduction", 
-     "Office Hours Impact", 
-     "Age Group Analysis",
-     "Geographic Patterns",
-     "Junction Safety Analysis",
-     "Comprehensive Analysis"]
-)
+def page_aggregate(name):
+    """A named aggregate from dashboard_data.AGGREGATES"""
+    result = None
+    path = aggregate_path(name)
+    if os.path.exists(path):
+        # The modification times only key the cache; read_aggregate makes the actual staleness check
+        result = saved_aggregate(name, os.path.getmtime(path), source_mtime())
+    if result is None:
+        result = compute_aggregate(name, get_data())
+    return result
 
-st.sidebar.markdown("---")
-st.sidebar.markdown("### Dataset Info")
-st.sidebar.metric("Total Accidents", f"{len(df):,}")
-st.sidebar.metric("Date Range", f"{df['Year'].min()} - {df['Year'].max()}")
-st.sidebar.metric("Total Casualties", f"{df['Number_of_Casualties'].sum():,}")
+# Every Junction page view is a projection of the junction_breakdown aggregate (a few hundred counts),
+# so the page never scans the accident rows
+def junction_accidents():
+    """junction_breakdown restricted to accidents at a junction"""
+    return page_aggregate('junction_breakdown').xs('Yes', level='At_Junction')
 
-# Main content
-st.markdown('<p class="main-header">UK Road Accidents Analysis Dashboard</p>', unsafe_allow_html=True)
-st.markdown("### Understanding Patterns: Office Hours, Middle-Aged Drivers & Geographic Factors")
-st.markdown("---")
+@st.cache_data(show_spinner=False)
+def pedestrian_by_control(junction_counts, column):
+    """Junction accidents with the labelled pedestrian crossing column as rows and junction control as columns"""
+    # The crossing codes already carry their readable labels as categories
+    table = junction_counts.groupby(level=[column, 'Junction_Control'], observed=True, dropna=False).sum().unstack(fill_value=0)
+    # A missing control is shown as its own 'nan' group
+    table.columns = table.columns.astype(str)
+    return table
 
-# ==================== PAGE 1: INTRODUCTION ====================
-if page == "Introduction":
-    st.markdown("## Welcome to the UK Road Accidents Analysis Dashboard")
-    
-    st.markdown("""
-    This comprehensive dashboard explores **UK road accidents data (2005-2023)** to uncover critical patterns 
-    and provide actionable insights for reducing accidents and saving lives.
-    
-    ### About This Analysis
-    
-    We analyzed over **2 million accident records** to understand the key factors contributing to road accidents 
-    in the United Kingdom. Our investigation focused on four critical dimensions:
-    """)
-    
-    # Four key insights overview
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        <div class="insight-box">
-        <h3>1️⃣ Office Hours & Commuting Patterns</h3>
-        <p>Investigating the relationship between work schedules and accident rates</p>
-        <ul>
-            <li>When do most accidents occur?</li>
-            <li>Are weekdays more dangerous than weekends?</li>
-            <li>What role does rush hour play?</li>
-        </ul>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("""
-        <div class="insight-box">
-        <h3>2️⃣ Age Group Analysis</h3>
-        <p>Understanding which age groups are most vulnerable on the roads</p>
-        <ul>
-            <li>Which age groups have the highest accident involvement?</li>
-            <li>Why are middle-aged drivers a focal point?</li>
-            <li>What factors contribute to their risk?</li>
-        </ul>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div class="insight-box">
-        <h3>3️⃣ Geographic Patterns</h3>
-        <p>Analyzing the spatial distribution of accidents across urban and rural areas</p>
-        <ul>
-            <li>Where are accident hotspots located?</li>
-            <li>How do urban and rural patterns differ?</li>
-            <li>Which local authorities need immediate attention?</li>
-        </ul>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("""
-        <div class="insight-box">
-        <h3>4️⃣ Junction Safety Analysis</h3>
-        <p>Examining the role of junction infrastructure in accident occurrence</p>
-        <ul>
-            <li>What percentage of accidents occur at junctions?</li>
-            <li>Which junction types are most dangerous?</li>
-            <li>How can infrastructure improvements reduce accidents?</li>
-        </ul>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    st.markdown("---")
-    
-    # Dataset overview
-    st.markdown("###  Dataset Overview")
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric("Total Accidents", f"{len(df):,}")
-    
-    with col2:
-        st.metric("Total Casualties", f"{df['Number_of_Casualties'].sum():,}")
-    
-    with col3:
-        st.metric("Date Range", f"{df['Year'].min()}-{df['Year'].max()}")
-    
-    with col4:
-        fatal_count = df[df['Accident_Severity'] == 'Fatal'].shape[0]
-        st.metric("Fatal Accidents", f"{fatal_count:,}")
-    
-    st.markdown("---")
-    
-    # How to use this dashboard
-    st.markdown("###  How to Navigate This Dashboard")
-    
-    st.markdown("""
-    Use the **sidebar** to explore each dimension of our analysis:
-    
-    1. **Office Hours Impact**: Discover when accidents peak and why commuting matters
-    2. **Age Group Analysis**: Learn about the demographics of accident involvement
-    3. **Geographic Patterns**: Explore accident hotspots across the UK
-    4. **Junction Safety Analysis**: Understand junction-related accidents and solutions
-    5. **Comprehensive Analysis**: See how all insights connect to form the complete picture
-    
-    Each page provides:
-    -  Interactive visualizations
-    -  Data-driven insights
-    -  Actionable recommendations
-    """)
+@st.cache_data(show_spinner=False)
+def t_junction_control_counts(junction_counts):
+    """Junction_Control counts for accidents at a T or staggered junction, most common first"""
+    detail = junction_counts.index.get_level_values('Junction_Detail')
+    is_t_junction = detail.astype(str).str.strip() == 'T or staggered junction'
+    jc_counts = junction_counts[is_t_junction].groupby(level='Junction_Control', observed=True, dropna=False).sum()
+    jc_counts.index = jc_counts.index.astype(str)
+    return jc_counts.sort_values(ascending=False)
+
+# The Junction page charts below are built from the small cached tables and cached themselves; the tables
+# are passed in, so the cached functions never reach get_data(). Each chart has a stable key, so on a rerun
+# the browser updates the existing plot instead of recreating it.
+@st.cache_data(show_spinner=False)
+def t_junction_figure(jc_counts):
+    """Junction control breakdown for accidents at T or staggered junctions"""
     
-    st.markdown("---")
+    fig = go.Figure(data=[
+        go.Bar(
+            x=jc_counts.index,
+            y=jc_counts.values,
+            texttemplate='%{y:,}',
+            textposition='outside',
+            marker_color='skyblue',
+            marker_line_color='black',
+            marker_line_width=1.5
+        )
+    ])
     
-    st.info(""" 
-    **Ready to begin?** Select any section from the sidebar to start exploring the data. 
-    We recommend starting with **Office Hours Impact** to understand temporal patterns, 
-    then moving through the other sections to build a complete understanding.
-    """)
+    fig.update_layout(
+        title="Junction Control for Accidents at 'T or staggered junction'",
+        xaxis_title='Junction Control',
+        yaxis_title='Number of Accidents',
+        height=500,
+        xaxis_tickangle=-45,
+        showlegend=False,
+        yaxis=dict(gridcolor='lightgray', gridwidth=0.5, griddash='dash')
+    )
+    return fig
 
-# ==================== PAGE 2: OFFICE HOURS IMPACT ====================
-elif page == "Office Hours Impact":
-    st.markdown("## Office Hours & Commuting Patterns")
-    
-    st.markdown("""
-    ### The Question: When are roads most dangerous?
-    Our hypothesis: **Peak accident times align with office commuting hours**, suggesting that work-related travel 
-    is a major risk factor.
+def t_junction_breakdown():
+    """T-junction control chart with its key finding"""
+    jc_counts = t_junction_control_counts(junction_accidents())
+    if jc_counts.empty:
+        return
+    
+    st.plotly_chart(t_junction_figure(jc_counts), use_container_width=True, key='t_junction_control')
+    
+    # Key insight
+    top_control = jc_counts.index[0]
+    top_count = jc_counts.values[0]
+    t_junction_total = jc_counts.sum()
+    st.warning(f"""
+    **Key Finding:** At T or staggered junctions, **{top_control}** has the highest accident count 
+    with **{top_count:,} accidents** ({top_count/t_junction_total*100:.1f}% of all T-junction accidents).
     """)
+
+@st.cache_data(show_spinner=False)
+def pedestrian_figure(table, column, xaxis_title):
+    """Grouped bars of a pedestrian crossing table against junction control"""
+    # Melt to long form once so px.bar builds every junction control trace in one call
+    long_table = table.melt(ignore_index=False, var_name='Junction Control', value_name='Accidents').reset_index()
+    fig = px.bar(
+        long_table,
+        x=column,
+        y='Accidents',
+        color='Junction Control',
+        barmode='group',
+        labels={column: xaxis_title}
+    )
+    # No outline stroke on the bars
+    fig.update_traces(marker_line_width=0)
     
-    # Hour of Day Analysis
-    st.markdown("###  Hourly Accident Distribution")
-    
-    accidents_per_hour = df['Hour'].value_counts().sort_index()
-    
+    fig.update_layout(
+        xaxis_title=xaxis_title,
+        yaxis_title='Number of Accidents',
+        barmode='group',
+        height=500,
+        xaxis_tickangle=-45,
+        showlegend=True,
+        legend=dict(title="Junction Control")
+    )
+    return fig
+
+def pedestrian_chart(column, xaxis_title):
+    """One pedestrian safety panel chart"""
+    table = pedestrian_by_control(junction_accidents(), column)
+    st.plotly_chart(pedestrian_figure(table, column, xaxis_title), use_container_width=True, key=column)
+
+def top_authorities(area, n=10):
+    """The n local authorities with the most accidents in the given area type"""
+    return page_aggregate('authority_counts')[area].nlargest(n).rename_axis('Local Authority').reset_index(name='Accidents')
+
+# The Office Hours figures depend only on the aggregates passed in (so get_data() stays outside the cache),
+# so the built figures are cached too and a rerun skips constructing them. Labels are formatted by Plotly
+# from the plotted values (e.g. 1.18M, 95.2k), so no separate label arrays are built or sent to the browser.
+@st.cache_data
+def hourly_figure(accidents_per_hour):
+    """Accidents per hour with the rush hours highlighted"""
     fig = go.Figure()
     fig.add_trace(go.Bar(
         x=accidents_per_hour.index,
         y=accidents_per_hour.values,
         marker_color=['red' if h in [8, 9, 17, 18] else 'steelblue' for h in accidents_per_hour.index],
-        text=accidents_per_hour.values,
+        texttemplate='%{y:.3s}',
         textposition='outside'
     ))
     
@@ -358,23 +265,17 @@ elif page == "Office Hours Impact":
         height=500,
         showlegend=False
     )
-    
-    st.plotly_chart(fig, use_container_width=True)
-    
-    # Heatmap
-    st.markdown("### Hour vs Day of Week Heatmap")
-    
-    day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    hour_day_pivot = df.groupby(['Hour', 'Day_of_Week']).size().unstack(fill_value=0)
-    hour_day_pivot = hour_day_pivot[day_order]
-    
+    return fig
+
+@st.cache_data
+def hour_day_heatmap(hour_day_pivot):
+    """Hour x day-of-week accident heatmap; the pivot's columns are already in Monday-Sunday order"""
     fig = go.Figure(data=go.Heatmap(
         z=hour_day_pivot.values,
-        x=day_order,
+        x=hour_day_pivot.columns,
         y=hour_day_pivot.index,
         colorscale='YlOrRd',
-        text=hour_day_pivot.values,
-        texttemplate='%{text}',
+        texttemplate='%{z:.3s}',
         textfont={"size": 8},
         colorbar=dict(title="Accidents")
     ))
@@ -385,850 +286,457 @@ elif page == "Office Hours Impact":
         yaxis_title="Hour of Day",
         height=700
     )
+    return fig
+
+# The Junction and Comprehensive pages only read cached aggregates. They have no widgets of their own, so
+# they render as plain functions called from the page dispatch below rather than as fragments.
+def render_junction():
+    """Junction Safety Analysis page"""
+    st.markdown("## Junction Safety Analysis: The Hidden Danger")
     
-    st.plotly_chart(fig, use_container_width=True)
+    st.markdown("""
+    ### Understanding Junction Accidents
     
-    col1, col2 = st.columns(2)
+    Junctions represent critical decision points where multiple traffic flows intersect. This analysis reveals 
+    which junction types are most dangerous and what can be done to improve safety.
+    """)
     
-    with col1:
-        st.markdown("### Weekday vs Weekend")
-        weekday_weekend = df.copy()
-        weekday_weekend['Day_Type'] = weekday_weekend['Day_of_Week'].apply(
-            lambda x: 'Weekend' if x in ['Saturday', 'Sunday'] else 'Weekday'
-        )
-        day_type_counts = weekday_weekend['Day_Type'].value_counts()
-        
-        fig = go.Figure(data=[go.Pie(
-            labels=day_type_counts.index,
-            values=day_type_counts.values,
-            hole=.4,
-            marker_colors=['#ff6b6b', '#4ecdc4']
-        )])
-        fig.update_layout(title="Weekdays Dominate Accident Statistics", height=400)
-        st.plotly_chart(fig, use_container_width=True)
+    # FIGURE 1: Accidents at Junction or Not
+    st.markdown("### Figure 1: Accidents Occurred at a Junction or Not")
     
-    with col2:
-        st.markdown("### Time Period Distribution")
-        time_period_counts = df['Time_Period'].value_counts()
-        
-        fig = px.bar(
-            x=time_period_counts.index,
-            y=time_period_counts.values,
-            color=time_period_counts.values,
-            color_continuous_scale='Reds'
-        )
-        fig.update_layout(
-            title="Daytime (Work Hours) Has Most Accidents",
-            xaxis_title="Time Period",
-            yaxis_title="Number of Accidents",
-            showlegend=False,
-            height=400
-        )
-        st.plotly_chart(fig, use_container_width=True)
+    # Binary junction indicator (At_Junction) is derived once in load_merged
+    junction_counts = page_aggregate('junction_breakdown').groupby(level='At_Junction', observed=True).sum().sort_values(ascending=False)
     
-    # Skip sunburst chart - causes categorical error
+    fig = go.Figure(data=[
+        go.Bar(
+            x=junction_counts.index,
+            y=junction_counts.values,
+            texttemplate='%{y:.3s}',
+            textposition='outside',
+            textfont=dict(size=14, color='black'),
+            marker_color=['#FF6B6B', '#4ECDC4']
+        )
+    ])
     
-    # Actionable Insights
-    st.markdown("---")
-    st.markdown("## Actionable Recommendations")
+    fig.update_layout(
+        title='Accidents: Occurred at a Junction or Not',
+        xaxis_title='Accident at Junction',
+        yaxis_title='Number of Accidents',
+        height=500,
+        showlegend=False
+    )
     
-    col1, col2 = st.columns(2)
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Calculate percentage
+    pct_at_junction = (junction_counts['Yes'] / junction_counts.sum() * 100)
+    st.info(f"**FIGURE 1** shows that about **{pct_at_junction:.0f}%** of the accidents occurred at a junction. Then, we wanted to see which type of junctions have had the most accidents.")
+    
+    st.markdown("---")
+    
+    # FIGURE 2: Accidents by Junction Type
+    st.markdown("### Figure 2: Accidents Occurring at Junctions")
+    
+    # Junction accidents only
+    junction_types = junction_accidents().groupby(level='Junction_Detail', observed=True).sum().sort_values(ascending=False).head(8)
+    
+    fig = go.Figure(data=[
+        go.Bar(
+            x=junction_types.index,
+            y=junction_types.values,
+            texttemplate='%{y:.3s}',
+            textposition='outside',
+            marker_color='#4ECDC4'
+        )
+    ])
+    
+    fig.update_layout(
+        title='Accidents Occurring at Junctions',
+        xaxis_title='Junction Type',
+        yaxis_title='Number of Accidents',
+        height=600,
+        xaxis_tickangle=-45
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.info("**FIGURE 2** shows that most of the accidents occur at **T or staggered junctions**.")
+    
+    # Junction illustrations and explanation
+    st.markdown("---")
+    st.markdown("### Understanding T-Junctions and Staggered Junctions")
+    
+    col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("""
-        ### For Employers:
-        - Implement **flexible work hours** (7-10 AM start times)
-        - Offer **work-from-home** options 2-3 days/week
-        - Provide **subsidized public transport** passes
-        - Create **carpool matching programs**
-        - Avoid scheduling early morning meetings
+        #### T-Junction
+        
+        A T-junction (or tee junction) is where a minor road meets a major road, forming a 'T' shape.
+        
+        **Why accidents occur:**
+        - Drivers from the minor road must cross high-speed incoming traffic
+        - Small mistakes in judging gaps or speed can result in collisions
+        - Limited time to make decisions
+        - Higher speed differences between merging vehicles
         """)
     
     with col2:
         st.markdown("""
-        ### For Policy Makers:
-        - Increase **traffic police presence** during rush hours
-        - Implement **smart traffic management** systems
-        - Create **dedicated bus/HOV lanes**
-        - Launch **"Safe Commute" awareness campaigns**
-        - Consider **congestion pricing** during peak hours
+        #### Staggered Junction
+        
+        A staggered junction has two minor roads meeting a major road at slightly offset points (not directly opposite).
+        
+        **Why accidents occur:**
+        - Poor visibility of oncoming traffic
+        - Confusing layout for drivers unfamiliar with the area
+        - Drivers need to cross traffic twice
+        - Increased accident risks due to complex maneuvering
         """)
-
-# ==================== PAGE 3: AGE GROUP ANALYSIS ====================
-elif page == "Age Group Analysis":
-    st.markdown("## Middle-Aged Drivers: The Hidden Risk Group")
     
-    st.markdown("""
-    ### The Question: Which age group is most vulnerable?
-    Conventional wisdom suggests young drivers are most at risk. Our data tells a different story...
-    """)
+    # Pedestrian Crossing Analysis
     
-    # Age distribution
-    age_counts = df['Age_Band_of_Driver'].value_counts().sort_index()
+    # NEW ANALYSIS: Junction Control and Junction Detail
+    st.markdown("---")
+    st.markdown("### Junction Control Type Analysis")
     
-    fig = go.Figure()
-    fig.add_trace(go.Bar(
-        x=age_counts.index,
-        y=age_counts.values,
-        marker_color=['red' if '26' in str(x) or '36' in str(x) or '46' in str(x) else 'steelblue' for x in age_counts.index],
-        text=age_counts.values,
-        textposition='outside'
-    ))
+    # Create grouped bar chart
+    # Only observed control/detail pairs are counted; empty category combinations are never built
+    junction_control_detail = junction_accidents().groupby(
+        level=['Junction_Control', 'Junction_Detail'], observed=True
+    ).sum().unstack(fill_value=0)
+    
+    # Long form (one row per control and detail, zero counts kept) so px.bar builds every detail trace in one call
+    control_detail_long = junction_control_detail.melt(ignore_index=False, value_name='Accidents').reset_index()
+    fig = px.bar(
+        control_detail_long,
+        x='Junction_Control',
+        y='Accidents',
+        color='Junction_Detail',
+        barmode='group'
+    )
     
     fig.update_layout(
-        title="Age Band Distribution: Middle-Aged Drivers Dominate",
-        xaxis_title="Driver Age Band",
-        yaxis_title="Number of Accidents",
-        height=500,
-        xaxis_tickangle=-45
+        title='Accidents by Junction Control and Junction Detail',
+        xaxis_title='Junction Control Type',
+        yaxis_title='Number of Accidents',
+        barmode='group',
+        height=600,
+        xaxis_tickangle=-45,
+        legend=dict(
+            title="Junction Detail",
+            orientation="v",
+            yanchor="top",
+            y=1,
+            xanchor="left",
+            x=1.02
+        )
     )
     
     st.plotly_chart(fig, use_container_width=True)
     
-    # Journey Purpose
-    st.markdown("### Journey Purpose Analysis")
-    journey_purpose = df['Journey_Purpose_of_Driver'].value_counts().head(10)
+    # T-Junction Specific Analysis
+    st.markdown("---")
+    st.markdown("### T or Staggered Junction - Control Type Breakdown")
+    st.info("""
+    **Why focus on T-junctions?** T or staggered junctions account for the highest number of accidents. 
+    Understanding the control mechanisms at these junctions helps identify where improvements are most needed.
+    """)
     
-    fig = px.bar(
-        x=journey_purpose.values,
-        y=journey_purpose.index,
-        orientation='h',
-        title='Top 10 Journey Purposes During Accidents',
-        labels={'x': 'Number of Accidents', 'y': 'Journey Purpose'},
-        color=journey_purpose.values,
-        color_continuous_scale='Sunset'
-    )
-    fig.update_layout(showlegend=False, height=500)
-    st.plotly_chart(fig, use_container_width=True)
+    t_junction_breakdown()
     
-    # Insights
+    # Pedestrian Crossing and Facilities Analysis
     st.markdown("---")
-    st.markdown("## Why Middle-Aged Drivers?")
+    st.markdown("### Pedestrian Safety at Junctions")
     
-    col1, col2, col3 = st.columns(3)
+    col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown("""
-        ### Exposure Factor
-        - Highest employment rate
-        - Daily commuting
-        - More time on roads
-        - Work-related travel
-        """)
+        st.markdown("#### Pedestrian Crossings (Human Control) vs Junction Control Type")
+        
+        pedestrian_chart('Pedestrian_Crossing-Human_Control', 'Pedestrian Crossing Type')
     
     with col2:
+        st.markdown("#### Pedestrian Facilities (Physical) vs Junction Control Type")
+        
+        pedestrian_chart('Pedestrian_Crossing-Physical_Facilities', 'Pedestrian Facility Type')
+    
+    # Actionable Insights
+    st.markdown("---")
+    st.markdown("## Actionable Insights")
+    
+    st.markdown("""
+    ### How can policymakers help in the reduction of these accidents?
+    
+    The government should take these steps to reduce the number of accidents at the junctions:
+    """)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
         st.markdown("""
-        ### Stress & Fatigue
-        - Work pressure
-        - Family responsibilities
-        - Long commutes
-        - Multitasking tendency
+        #### Infrastructure Improvements:
+        
+        1. **Realign staggered junctions** so the two minor roads are directly opposite, turning it into a simple crossroads
+        
+        2. **Upgrade dangerous T-junctions into roundabouts**, which slow down traffic and reduce severe collisions
+        
+        3. **Add traffic signals** where traffic volume is high or visibility is poor
+        
+        4. **Install dedicated turning lanes** so vehicles don't block or confuse traffic
+        
+        5. **Introduce raised junctions** to physically slow down speeding vehicles
         """)
     
-    with col3:
+    with col2:
         st.markdown("""
-        ### Solutions
-        - Workplace wellness programs
-        - Flexible schedules
-        - Defensive driving courses
-        - Health screenings (40+)
+        #### Signage and Speed Management:
+        
+        6. **Reduce speed limits near dangerous junctions** to give drivers more reaction time
+        
+        7. **High-contrast STOP or GIVE WAY signs** for better visibility in all conditions
+        
+        8. **Advance warning signs** like "Junction Ahead" placed at appropriate distances
+        
+        9. **Restrict parking near junction mouths** to improve visibility and sight lines
         """)
 
-# ==================== PAGE 4: GEOGRAPHIC PATTERNS ====================
-elif page == "Geographic Patterns":
-    st.markdown("## Geographic Patterns: Urban vs Rural Dynamics")
+# Static insight boxes for the Comprehensive page, built once at import; only the risk profile
+# takes values, filled in through a Template
+OFFICE_HOURS_FINDING_HTML = """
+    <div class="insight-box">
+    <h3>Finding #1: Office Hours Pattern</h3>
+    <p><strong>Peak times: 8-9 AM and 5-6 PM</strong></p>
+    <ul>
+        <li>Weekdays have 40% more accidents than weekends</li>
+        <li>Rush hour accounts for 30% of daily accidents</li>
+        <li>Commuting is the primary journey purpose</li>
+    </ul>
+    </div>
+"""
+
+MIDDLE_AGED_FINDING_HTML = """
+    <div class="insight-box">
+    <h3>Finding #2: Middle-Aged Drivers</h3>
+    <p><strong>Ages 26-55: Highest accident involvement</strong></p>
+    <ul>
+        <li>Peak working-age population on roads</li>
+        <li>Daily commuting increases exposure</li>
+        <li>Stress and fatigue factors</li>
+    </ul>
+    </div>
+"""
+
+URBAN_RURAL_FINDING_HTML = """
+    <div class="insight-box">
+    <h3>Finding #3: Urban vs Rural</h3>
+    <p><strong>Different patterns, different solutions</strong></p>
+    <ul>
+        <li>Urban: High volume, lower severity</li>
+        <li>Rural: Lower volume, higher severity</li>
+        <li>Urban hotspots need targeted intervention</li>
+    </ul>
+    </div>
+"""
+
+JUNCTION_FINDING_HTML = """
+    <div class="insight-box">
+    <h3>Finding #4: Junction Hazards</h3>
+    <p><strong>60% of accidents at junctions</strong></p>
+    <ul>
+        <li>T-junctions & staggered junctions most dangerous</li>
+        <li>Give way/uncontrolled junctions = 80% of junction accidents</li>
+        <li>Infrastructure improvements critical</li>
+    </ul>
+    </div>
+"""
+
+RISK_PROFILE_HTML = Template("""
+    <div class="insight-box">
+    <h3>Maximum Risk Profile</h3>
+    <p>All factors aligned for highest accident probability:</p>
+    <ul>
+        <li>✓ Rush hour (8-9 AM / 5-6 PM)</li>
+        <li>✓ Middle-aged driver (26-55)</li>
+        <li>✓ Urban location</li>
+        <li>✓ Weekday</li>
+        <li>✓ At T-junction/staggered junction</li>
+    </ul>
+    <hr style="border: 1px solid #ddd; margin: 15px 0;">
+    <h4 style="color: #333;">Impact</h4>
+    <p style="font-size: 1.3rem; color: #d32f2f;"><strong>${count} accidents</strong></p>
+    <p style="font-size: 1.1rem; color: #d32f2f;"><strong>${pct}% of all accidents</strong></p>
+    </div>
+""")
+
+COMMUTER_STORY_HTML = """
+    <div class="insight-box">
+    <h3>Meet Sarah: The Commuter</h3>
+    <p><strong>38-year-old marketing manager | Birmingham</strong></p>
+    <h4 style="color: #333;">Daily Routine:</h4>
+    <table style="width: 100%; border-collapse: collapse; color: #333;">
+        <tr style="border-bottom: 1px solid #ddd;">
+            <td style="padding: 8px; width: 30%; color: #333;"><strong>7:30 AM</strong></td>
+            <td style="padding: 8px; color: #333;">Leaves home (rural area)</td>
+        </tr>
+        <tr style="border-bottom: 1px solid #ddd;">
+            <td style="padding: 8px; color: #333;"><strong>7:45 AM</strong></td>
+            <td style="padding: 8px; color: #333;">Rural roads (poor lighting, high speeds)</td>
+        </tr>
+        <tr style="border-bottom: 1px solid #ddd;">
+            <td style="padding: 8px; color: #333;"><strong>8:15 AM</strong></td>
+            <td style="padding: 8px; color: #333;">Motorway (congestion, stress)</td>
+        </tr>
+        <tr style="border-bottom: 1px solid #ddd;">
+            <td style="padding: 8px; color: #333;"><strong>8:45 AM</strong></td>
+            <td style="padding: 8px; color: #333;">Urban streets (complex junctions)</td>
+        </tr>
+        <tr>
+            <td style="padding: 8px; color: #333;"><strong>9:00 AM</strong></td>
+            <td style="padding: 8px; color: #333;">Arrives at office</td>
+        </tr>
+    </table>
+    <p style="margin-top: 15px; padding: 10px; background-color: #fff3cd; border-left: 4px solid #ffc107; color: #333;">
+    <strong>Sarah faces:</strong> 4 junction crossings, 2 T-junctions, rush hour traffic daily.<br>
+    She represents <strong>millions of UK commuters</strong> at maximum risk.
+    </p>
+    </div>
+"""
+
+IMMEDIATE_ACTIONS_HTML = """
+    <div class="insight-box">
+    <h3>Immediate (0-6 months)</h3>
+    <p><strong>Quick Wins - Low Cost, High Impact</strong></p>
+    <ul>
+        <li><strong>Flexible Work Hours:</strong> Partner with 1000+ employers to stagger start times</li>
+        <li><strong>Junction Signage:</strong> Install high-contrast signs at 500 dangerous T-junctions</li>
+        <li><strong>Speed Reduction:</strong> Lower limits near 200 high-risk junctions</li>
+        <li><strong>Public Campaign:</strong> Target middle-aged commuters via radio/digital ads</li>
+    </ul>
+    <p><strong>Cost:</strong> £50M | <strong>Expected Impact:</strong> 10-15% reduction</p>
+    </div>
+"""
+
+MEDIUM_TERM_ACTIONS_HTML = """
+    <div class="insight-box">
+    <h3>Medium-Term (6-18 months)</h3>
+    <p><strong>Infrastructure & Technology</strong></p>
+    <ul>
+        <li><strong>Smart Traffic Lights:</strong> AI-powered systems at 100 urban junctions</li>
+        <li><strong>Roundabout Conversions:</strong> Replace 50 dangerous T-junctions</li>
+        <li><strong>Public Transport:</strong> Expand capacity by 30% on commuter routes</li>
+        <li><strong>Junction Upgrades:</strong> Add turning lanes, improve visibility</li>
+    </ul>
+    <p><strong>Cost:</strong> £300M | <strong>Expected Impact:</strong> 25-30% reduction</p>
+    </div>
+"""
+
+LONG_TERM_ACTIONS_HTML = """
+    <div class="insight-box">
+    <h3>Long-Term (18+ months)</h3>
+    <p><strong>Systemic Transformation</strong></p>
+    <ul>
+        <li><strong>Urban Redesign:</strong> Mixed-use development to reduce commute distance</li>
+        <li><strong>Remote Work:</strong> National infrastructure for 50% remote capability</li>
+        <li><strong>Junction Elimination:</strong> Grade-separated crossings at major routes</li>
+        <li><strong>Behavioral Change:</strong> Mandatory defensive driving for 40+ drivers</li>
+    </ul>
+    <p><strong>Cost:</strong> £1B+ | <strong>Expected Impact:</strong> 40-50% reduction</p>
+    </div>
+"""
+
+def render_comprehensive():
+    """Comprehensive Analysis page"""
+    # Every figure on this page comes from one cached aggregate, computed in a single pass over the frame
+    stats = page_aggregate('comprehensive_stats')
+    
+    st.markdown("## The Complete Picture: Connecting All Insights")
     
     st.markdown("""
-    ### The Question: Where are accidents concentrated?
-    Understanding geographic patterns helps us allocate resources and design targeted interventions.
+    ### The Perfect Storm: When, Who, and Where Collide
+    
+    Our analysis reveals that UK road accidents are not random events, but follow clear patterns driven by 
+    **commuting behavior, demographics, and geography**.
     """)
     
-    # Summary statistics
-    col1, col2, col3 = st.columns(3)
+    # Executive Summary: Key Findings
+    st.markdown("---")
+    st.markdown("##  Executive Summary: Key Findings")
     
-    urban_total = df[df['Urban_or_Rural_Area'] == 'Urban'].shape[0]
-    rural_total = df[df['Urban_or_Rural_Area'] == 'Rural'].shape[0]
-    total = urban_total + rural_total
+    # Key metrics row
+    col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Urban Accidents", f"{urban_total:,}", f"{urban_total/total*100:.1f}%")
+        st.metric("Peak Accident Hour", f"{stats['peak_hour']}:00", "Rush Hour")
     
     with col2:
-        st.metric("Rural Accidents", f"{rural_total:,}", f"{rural_total/total*100:.1f}%")
+        st.metric("Most Dangerous Day", stats['peak_day'], "Weekday")
     
     with col3:
-        urban_fatal = df[(df['Urban_or_Rural_Area'] == 'Urban') & (df['Accident_Severity'] == 'Fatal')].shape[0]
-        rural_fatal = df[(df['Urban_or_Rural_Area'] == 'Rural') & (df['Accident_Severity'] == 'Fatal')].shape[0]
-        st.metric("Rural Fatal Rate", f"{rural_fatal/rural_total*100:.2f}%", 
-                 f"vs Urban: {urban_fatal/urban_total*100:.2f}%")
-    
-    # Density Heatmap
-    st.markdown("### UK Road Accidents Density Heatmap")
-    
-    # Load pre-generated map to avoid runtime plotting
-    map_file = 'maps/density_heatmap.html'
-    if os.path.exists(map_file):
-        with open(map_file, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        st.components.v1.html(html_content, height=700, scrolling=True)
-    else:
-        st.warning("Map not found. Please run generate_maps.py first to create static maps.")
-    
-    # Urban vs Rural Map
-    st.markdown("### Urban vs Rural: Local Authority Classification")
+        st.metric("Urban Accidents", f"{stats['urban_pct']:.1f}%", "Higher Volume")
     
-    # Load pre-generated map to avoid runtime plotting
-    map_file = 'maps/urban_vs_rural_map.html'
-    if os.path.exists(map_file):
-        with open(map_file, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        st.components.v1.html(html_content, height=800, scrolling=True)
-    else:
-        st.warning("Map not found. Please run generate_maps.py first to create static maps.")
+    with col4:
+        st.metric("Middle-Aged Drivers", f"{stats['middle_aged_pct']:.1f}%", "Highest Risk")
     
-    # Detailed comparison - Load 4 separate pre-generated charts
-    st.markdown("### Urban vs Rural Detailed Comparison")
+    st.markdown("---")
     
-    # Create 2x2 grid
-    col1, col2 = st.columns(2)
+    # Four key insights with junction safety
+    col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        # Chart 1: Accident Count
-        chart1_path = os.path.join('maps', 'urban_rural_chart1_count.html')
-        if os.path.exists(chart1_path):
-            with open(chart1_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            st.components.v1.html(html_content, height=450, scrolling=False)
-        else:
-            st.warning("⚠️ Chart 1 not found. Run 'python generate_maps.py'")
+        st.markdown(OFFICE_HOURS_FINDING_HTML, unsafe_allow_html=True)
     
     with col2:
-        # Chart 2: Urban Severity
-        chart2_path = os.path.join('maps', 'urban_rural_chart2_urban_severity.html')
-        if os.path.exists(chart2_path):
-            with open(chart2_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            st.components.v1.html(html_content, height=450, scrolling=False)
-        else:
-            st.warning("⚠️ Chart 2 not found. Run 'python generate_maps.py'")
-    
-    col3, col4 = st.columns(2)
+        st.markdown(MIDDLE_AGED_FINDING_HTML, unsafe_allow_html=True)
     
     with col3:
-        # Chart 3: Rural Severity
-        chart3_path = os.path.join('maps', 'urban_rural_chart3_rural_severity.html')
-        if os.path.exists(chart3_path):
-            with open(chart3_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            st.components.v1.html(html_content, height=450, scrolling=False)
-        else:
-            st.warning("⚠️ Chart 3 not found. Run 'python generate_maps.py'")
+        st.markdown(URBAN_RURAL_FINDING_HTML, unsafe_allow_html=True)
     
     with col4:
-        # Chart 4: Casualties Comparison
-        chart4_path = os.path.join('maps', 'urban_rural_chart4_casualties.html')
-        if os.path.exists(chart4_path):
-            with open(chart4_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            st.components.v1.html(html_content, height=450, scrolling=False)
-        else:
-            st.warning("⚠️ Chart 4 not found. Run 'python generate_maps.py'")
+        st.markdown(JUNCTION_FINDING_HTML, unsafe_allow_html=True)
     
-    # Top dangerous areas
-    col1, col2 = st.columns(2)
+    st.markdown("---")
+    st.markdown("## The Perfect Storm")
+    
+    st.markdown("""
+    **Four critical factors converge to create maximum accident risk:**
+    """)
+    
+    junction_pct = 60.0  # Based on your analysis
+    
+    col1, col2, col3, col4, col5 = st.columns(5)
     
     with col1:
-        st.markdown("### Top 10 Urban Hotspots")
-        urban_df = df[df['Urban_or_Rural_Area'] == 'Urban']
-        top_urban = urban_df['Local_Authority_(District)'].value_counts().head(10)
-        st.dataframe(top_urban.reset_index().rename(columns={
-            'index': 'Local Authority',
-            'Local_Authority_(District)': 'Accidents'
-        }), use_container_width=True)
+        st.metric("Rush Hours", f"{stats['rush_hour_pct']:.1f}%", "8-9 AM, 5-6 PM")
     
     with col2:
-        st.markdown("### Top 10 Rural Hotspots")
-        rural_df = df[df['Urban_or_Rural_Area'] == 'Rural']
-        top_rural = rural_df['Local_Authority_(District)'].value_counts().head(10)
-        st.dataframe(top_rural.reset_index().rename(columns={
-            'index': 'Local Authority',
-            'Local_Authority_(District)': 'Accidents'
-        }), use_container_width=True)
+        st.metric("Middle-Aged", f"{stats['middle_aged_pct']:.1f}%", "Ages 26-55")
+    
+    with col3:
+        st.metric("Urban Areas", f"{stats['urban_known_pct']:.1f}%", "High density")
+    
+    with col4:
+        st.metric("Weekdays", f"{stats['weekday_pct']:.1f}%", "Work commute")
+    
+    with col5:
+        st.metric("At Junctions", f"{junction_pct:.1f}%", "T-junctions worst")
     
-    # Recommendations
     st.markdown("---")
-    st.markdown("## Targeted Interventions")
     
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        ### Urban Areas Strategy:
-        - **Smart traffic management** systems
-        - **More roundabouts** at high-risk junctions
-        - **Expanded public transport** networks
-        - **Congestion pricing** during peak hours
-        - **Automated enforcement** (cameras)
-        - **Reduced parking** in city centers
-        """)
-    
-    with col2:
-        st.markdown("""
-        ### Rural Areas Strategy:
-        - **Variable speed limits** based on conditions
-        - **Safety barriers** on dangerous curves
-        - **Improved road markings** and signage
-        - **Better street lighting** near villages
-        - **Wildlife warning systems**
-        - **Faster emergency response** positioning
-        """)
-
-# ==================== PAGE 5: JUNCTION SAFETY ANALYSIS ====================
-elif page == "Junction Safety Analysis":
-    st.markdown("## Junction Safety Analysis: The Hidden Danger")
-    
-    st.markdown("""
-    ### Understanding Junction Accidents
-    
-    Junctions represent critical decision points where multiple traffic flows intersect. This analysis reveals 
-    which junction types are most dangerous and what can be done to improve safety.
-    """)
-    
-    # FIGURE 1: Accidents at Junction or Not
-    st.markdown("### Figure 1: Accidents Occurred at a Junction or Not")
-    
-    # Create binary junction indicator
-    if 'Junction_Detail' in df.columns:
-        df['At_Junction'] = df['Junction_Detail'].apply(
-            lambda x: 'Yes' if pd.notna(x) and str(x).lower() not in ['not at junction', 'not at junction or within 20 metres', 'data missing or out of range'] else 'No'
-        )
-    elif 'Junction_Control' in df.columns:
-        df['At_Junction'] = df['Junction_Control'].apply(
-            lambda x: 'Yes' if pd.notna(x) and str(x).lower() not in ['not at junction', 'not at junction or within 20 metres', 'data missing or out of range'] else 'No'
-        )
-    
-    junction_counts = df['At_Junction'].value_counts()
-    
-    fig = go.Figure(data=[
-        go.Bar(
-            x=junction_counts.index,
-            y=junction_counts.values,
-            text=junction_counts.values,
-            textposition='outside',
-            textfont=dict(size=14, color='black'),
-            marker_color=['#FF6B6B', '#4ECDC4']
-        )
-    ])
-    
-    fig.update_layout(
-        title='Accidents: Occurred at a Junction or Not',
-        xaxis_title='Accident at Junction',
-        yaxis_title='Number of Accidents',
-        height=500,
-        showlegend=False
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
-    
-    # Calculate percentage
-    pct_at_junction = (junction_counts['Yes'] / junction_counts.sum() * 100)
-    st.info(f"**FIGURE 1** shows that about **{pct_at_junction:.0f}%** of the accidents occurred at a junction. Then, we wanted to see which type of junctions have had the most accidents.")
-    
-    st.markdown("---")
-    
-    # FIGURE 2: Accidents by Junction Type
-    st.markdown("### Figure 2: Accidents Occurring at Junctions")
-    
-    if 'Junction_Detail' in df.columns:
-        # Filter for junction accidents only
-        junction_df = df[df['At_Junction'] == 'Yes']
-        junction_types = junction_df['Junction_Detail'].value_counts().head(8)
-        
-        fig = go.Figure(data=[
-            go.Bar(
-                x=junction_types.index,
-                y=junction_types.values,
-                text=junction_types.values,
-                textposition='outside',
-                marker_color='#4ECDC4'
-            )
-        ])
-        
-        fig.update_layout(
-            title='Accidents Occurring at Junctions',
-            xaxis_title='Junction Type',
-            yaxis_title='Number of Accidents',
-            height=600,
-            xaxis_tickangle=-45
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-        
-        st.info("**FIGURE 2** shows that most of the accidents occur at **T or staggered junctions**.")
-        
-        # Junction illustrations and explanation
-        st.markdown("---")
-        st.markdown("### Understanding T-Junctions and Staggered Junctions")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("""
-            #### T-Junction
-            
-            A T-junction (or tee junction) is where a minor road meets a major road, forming a 'T' shape.
-            
-            **Why accidents occur:**
-            - Drivers from the minor road must cross high-speed incoming traffic
-            - Small mistakes in judging gaps or speed can result in collisions
-            - Limited time to make decisions
-            - Higher speed differences between merging vehicles
-            """)
-        
-        with col2:
-            st.markdown("""
-            #### Staggered Junction
-            
-            A staggered junction has two minor roads meeting a major road at slightly offset points (not directly opposite).
-            
-            **Why accidents occur:**
-            - Poor visibility of oncoming traffic
-            - Confusing layout for drivers unfamiliar with the area
-            - Drivers need to cross traffic twice
-            - Increased accident risks due to complex maneuvering
-            """)
-        
-        # Pedestrian Crossing Analysis
-        
-        # NEW ANALYSIS: Junction Control and Junction Detail
-        st.markdown("---")
-        st.markdown("### Junction Control Type Analysis")
-        
-        if 'Junction_Control' in df.columns:
-            # Create grouped bar chart
-            junction_control_detail = pd.crosstab(
-                junction_df['Junction_Control'],
-                junction_df['Junction_Detail']
-            )
-            
-            fig = go.Figure()
-            
-            for junction_type in junction_control_detail.columns:
-                fig.add_trace(go.Bar(
-                    name=junction_type,
-                    x=junction_control_detail.index,
-                    y=junction_control_detail[junction_type]
-                ))
-            
-            fig.update_layout(
-                title='Accidents by Junction Control and Junction Detail',
-                xaxis_title='Junction Control Type',
-                yaxis_title='Number of Accidents',
-                barmode='group',
-                height=600,
-                xaxis_tickangle=-45,
-                legend=dict(
-                    title="Junction Detail",
-                    orientation="v",
-                    yanchor="top",
-                    y=1,
-                    xanchor="left",
-                    x=1.02
-                )
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-        
-        # T-Junction Specific Analysis
-        st.markdown("---")
-        st.markdown("### T or Staggered Junction - Control Type Breakdown")
-        st.info("""
-        **Why focus on T-junctions?** T or staggered junctions account for the highest number of accidents. 
-        Understanding the control mechanisms at these junctions helps identify where improvements are most needed.
-        """)
-        
-        if 'Junction_Detail' in df.columns and 'Junction_Control' in df.columns:
-            # Filter to T or staggered junction - convert categorical to string to avoid error
-            df_t = junction_df[junction_df['Junction_Detail'].astype(str).str.strip() == 'T or staggered junction']
-            
-            if not df_t.empty:
-                # Convert categorical to string for Junction_Control too
-                jc_counts = df_t['Junction_Control'].astype(str).value_counts()
-                
-                fig = go.Figure(data=[
-                    go.Bar(
-                        x=jc_counts.index,
-                        y=jc_counts.values,
-                        text=[f'{int(v):,}' for v in jc_counts.values],
-                        textposition='outside',
-                        marker_color='skyblue',
-                        marker_line_color='black',
-                        marker_line_width=1.5
-                    )
-                ])
-                
-                fig.update_layout(
-                    title="Junction Control for Accidents at 'T or staggered junction'",
-                    xaxis_title='Junction Control',
-                    yaxis_title='Number of Accidents',
-                    height=500,
-                    xaxis_tickangle=-45,
-                    showlegend=False,
-                    yaxis=dict(gridcolor='lightgray', gridwidth=0.5, griddash='dash')
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Key insight
-                top_control = jc_counts.index[0]
-                top_count = jc_counts.values[0]
-                st.warning(f"""
-                **Key Finding:** At T or staggered junctions, **{top_control}** has the highest accident count 
-                with **{top_count:,} accidents** ({top_count/len(df_t)*100:.1f}% of all T-junction accidents).
-                """)
-        
-        # Pedestrian Crossing and Facilities Analysis
-        st.markdown("---")
-        st.markdown("### Pedestrian Safety at Junctions")
-        
-        # Create mapping dictionaries for readable labels
-        ped_human_control_map = {
-            0: 'No physical crossing facilities within 50 metres',
-            1: 'Control by school crossing patrol',
-            2: 'Control by other authorised person',
-            4: 'Pedestrian phase at traffic signal junction',
-            5: 'Zebra',
-            -1: 'Data missing or out of range'
-        }
-        
-        ped_physical_facilities_map = {
-            0: 'No facilities',
-            1: 'Zebra',
-            4: 'Pelican, puffin, toucan or similar',
-            5: 'Pedestrian phase at traffic signal junction',
-            7: 'Footbridge or subway',
-            8: 'Central refuge',
-            -1: 'Data missing or out of range',
-            9: 'Unknown (self reported)'
-        }
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("#### Pedestrian Crossings (Human Control) vs Junction Control Type")
-            
-            if 'Pedestrian_Crossing-Human_Control' in df.columns and 'Junction_Control' in df.columns:
-                # Map numeric codes to readable labels - avoid full dataframe copy
-                ped_human_series = junction_df['Pedestrian_Crossing-Human_Control'].map(ped_human_control_map).fillna('Unknown')
-                junction_control_series = junction_df['Junction_Control'].astype(str)
-                
-                ped_crossing_junction = pd.crosstab(
-                    ped_human_series,
-                    junction_control_series
-                )
-                
-                fig = go.Figure()
-                
-                for control_type in ped_crossing_junction.columns:
-                    fig.add_trace(go.Bar(
-                        name=control_type,
-                        x=ped_crossing_junction.index,
-                        y=ped_crossing_junction[control_type]
-                    ))
-                
-                fig.update_layout(
-                    xaxis_title='Pedestrian Crossing Type',
-                    yaxis_title='Number of Accidents',
-                    barmode='group',
-                    height=500,
-                    xaxis_tickangle=-45,
-                    showlegend=True,
-                    legend=dict(title="Junction Control")
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            st.markdown("#### Pedestrian Facilities (Physical) vs Junction Control Type")
-            
-            if 'Pedestrian_Crossing-Physical_Facilities' in df.columns and 'Junction_Control' in df.columns:
-                # Map numeric codes to readable labels - avoid full dataframe copy
-                ped_physical_series = junction_df['Pedestrian_Crossing-Physical_Facilities'].map(ped_physical_facilities_map).fillna('Unknown')
-                junction_control_series = junction_df['Junction_Control'].astype(str)
-                
-                ped_facilities_junction = pd.crosstab(
-                    ped_physical_series,
-                    junction_control_series
-                )
-                
-                fig = go.Figure()
-                
-                for control_type in ped_facilities_junction.columns:
-                    fig.add_trace(go.Bar(
-                        name=control_type,
-                        x=ped_facilities_junction.index,
-                        y=ped_facilities_junction[control_type]
-                    ))
-                
-                fig.update_layout(
-                    xaxis_title='Pedestrian Facility Type',
-                    yaxis_title='Number of Accidents',
-                    barmode='group',
-                    height=500,
-                    xaxis_tickangle=-45,
-                    showlegend=True,
-                    legend=dict(title="Junction Control")
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
-        
-        # Actionable Insights
-        st.markdown("---")
-        st.markdown("## Actionable Insights")
-        
-        st.markdown("""
-        ### How can policymakers help in the reduction of these accidents?
-        
-        The government should take these steps to reduce the number of accidents at the junctions:
-        """)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("""
-            #### Infrastructure Improvements:
-            
-            1. **Realign staggered junctions** so the two minor roads are directly opposite, turning it into a simple crossroads
-            
-            2. **Upgrade dangerous T-junctions into roundabouts**, which slow down traffic and reduce severe collisions
-            
-            3. **Add traffic signals** where traffic volume is high or visibility is poor
-            
-            4. **Install dedicated turning lanes** so vehicles don't block or confuse traffic
-            
-            5. **Introduce raised junctions** to physically slow down speeding vehicles
-            """)
-        
-        with col2:
-            st.markdown("""
-            #### Signage and Speed Management:
-            
-            6. **Reduce speed limits near dangerous junctions** to give drivers more reaction time
-            
-            7. **High-contrast STOP or GIVE WAY signs** for better visibility in all conditions
-            
-            8. **Advance warning signs** like "Junction Ahead" placed at appropriate distances
-            
-            9. **Restrict parking near junction mouths** to improve visibility and sight lines
-            """)
-    
-    else:
-        st.warning("Junction detail columns not found in the dataset. Please upload a dataset with Junction_Detail information.")
-
-
-# ==================== PAGE 6: COMPREHENSIVE ANALYSIS ====================
-elif page == "Comprehensive Analysis":
-    st.markdown("## The Complete Picture: Connecting All Insights")
-    
-    st.markdown("""
-    ### The Perfect Storm: When, Who, and Where Collide
-    
-    Our analysis reveals that UK road accidents are not random events, but follow clear patterns driven by 
-    **commuting behavior, demographics, and geography**.
-    """)
-    
-    # Executive Summary: Key Findings
-    st.markdown("---")
-    st.markdown("##  Executive Summary: Key Findings")
-    
-    # Key metrics row
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        peak_hour = df['Hour'].value_counts().idxmax()
-        st.metric("Peak Accident Hour", f"{int(peak_hour)}:00", "Rush Hour")
-    
-    with col2:
-        peak_day = df['Day_of_Week'].value_counts().idxmax()
-        st.metric("Most Dangerous Day", peak_day, "Weekday")
-    
-    with col3:
-        urban_pct = (df['Urban_or_Rural_Area'] == 'Urban').sum() / len(df) * 100
-        st.metric("Urban Accidents", f"{urban_pct:.1f}%", "Higher Volume")
-    
-    with col4:
-        middle_aged = df[df['Age_Band_of_Driver'].str.contains('26|36|46', na=False)].shape[0]
-        middle_aged_pct = middle_aged / len(df) * 100
-        st.metric("Middle-Aged Drivers", f"{middle_aged_pct:.1f}%", "Highest Risk")
-    
-    st.markdown("---")
-    
-    # Four key insights with junction safety
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.markdown("""
-        <div class="insight-box">
-        <h3>Finding #1: Office Hours Pattern</h3>
-        <p><strong>Peak times: 8-9 AM and 5-6 PM</strong></p>
-        <ul>
-            <li>Weekdays have 40% more accidents than weekends</li>
-            <li>Rush hour accounts for 30% of daily accidents</li>
-            <li>Commuting is the primary journey purpose</li>
-        </ul>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div class="insight-box">
-        <h3>Finding #2: Middle-Aged Drivers</h3>
-        <p><strong>Ages 26-55: Highest accident involvement</strong></p>
-        <ul>
-            <li>Peak working-age population on roads</li>
-            <li>Daily commuting increases exposure</li>
-            <li>Stress and fatigue factors</li>
-        </ul>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown("""
-        <div class="insight-box">
-        <h3>Finding #3: Urban vs Rural</h3>
-        <p><strong>Different patterns, different solutions</strong></p>
-        <ul>
-            <li>Urban: High volume, lower severity</li>
-            <li>Rural: Lower volume, higher severity</li>
-            <li>Urban hotspots need targeted intervention</li>
-        </ul>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col4:
-        st.markdown("""
-        <div class="insight-box">
-        <h3>Finding #4: Junction Hazards</h3>
-        <p><strong>60% of accidents at junctions</strong></p>
-        <ul>
-            <li>T-junctions & staggered junctions most dangerous</li>
-            <li>Give way/uncontrolled junctions = 80% of junction accidents</li>
-            <li>Infrastructure improvements critical</li>
-        </ul>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    st.markdown("---")
-    st.markdown("## The Perfect Storm")
-    
-    st.markdown("""
-    **Four critical factors converge to create maximum accident risk:**
-    """)
-    
-    # Calculate key statistics
-    peak_hours = df[df['Hour'].isin([8, 9, 17, 18])].shape[0]
-    peak_pct = peak_hours / len(df) * 100
-    
-    middle_aged = df[df['Age_Band_of_Driver'].str.contains('26|36|46', na=False)].shape[0]
-    middle_aged_pct = middle_aged / len(df) * 100
-    
-    urban_accidents = df[df['Urban_or_Rural_Area'] == 'Urban'].shape[0]
-    urban_pct = urban_accidents / len(df[df['Urban_or_Rural_Area'].notna()]) * 100
-    
-    weekday_accidents = df[~df['Day_of_Week'].isin(['Saturday', 'Sunday'])].shape[0]
-    weekday_pct = weekday_accidents / len(df) * 100
-    
-    junction_accidents = df['Did_Police_Officer_Attend_Scene_of_Accident'].notna().sum()  # Placeholder
-    junction_pct = 60.0  # Based on your analysis
-    
-    col1, col2, col3, col4, col5 = st.columns(5)
-    
-    with col1:
-        st.metric("Rush Hours", f"{peak_pct:.1f}%", "8-9 AM, 5-6 PM")
-    
-    with col2:
-        st.metric("Middle-Aged", f"{middle_aged_pct:.1f}%", "Ages 26-55")
-    
-    with col3:
-        st.metric("Urban Areas", f"{urban_pct:.1f}%", "High density")
-    
-    with col4:
-        st.metric("Weekdays", f"{weekday_pct:.1f}%", "Work commute")
-    
-    with col5:
-        st.metric("At Junctions", f"{junction_pct:.1f}%", "T-junctions worst")
-    
-    st.markdown("---")
-    
-    # The high-risk scenario
-    st.markdown("## High-Risk Scenario Analysis")
-    
-    # Filter for the perfect storm scenario
-    perfect_storm = df[
-        (df['Hour'].isin([8, 9, 17, 18])) &
-        (df['Age_Band_of_Driver'].str.contains('26|36|46', na=False)) &
-        (df['Urban_or_Rural_Area'] == 'Urban') &
-        (~df['Day_of_Week'].isin(['Saturday', 'Sunday']))
-    ]
-    
-    perfect_storm_pct = len(perfect_storm) / len(df) * 100
+    # The high-risk scenario
+    st.markdown("## High-Risk Scenario Analysis")
     
     # Improved layout with better alignment
     col1, col2 = st.columns([1, 1])
     
     with col1:
-        st.markdown("""
-        <div class="insight-box">
-        <h3>Maximum Risk Profile</h3>
-        <p>All factors aligned for highest accident probability:</p>
-        <ul>
-            <li>✓ Rush hour (8-9 AM / 5-6 PM)</li>
-            <li>✓ Middle-aged driver (26-55)</li>
-            <li>✓ Urban location</li>
-            <li>✓ Weekday</li>
-            <li>✓ At T-junction/staggered junction</li>
-        </ul>
-        <hr style="border: 1px solid #ddd; margin: 15px 0;">
-        <h4 style="color: #333;">Impact</h4>
-        <p style="font-size: 1.3rem; color: #d32f2f;"><strong>{:,} accidents</strong></p>
-        <p style="font-size: 1.1rem; color: #d32f2f;"><strong>{:.1f}% of all accidents</strong></p>
-        </div>
-        """.format(len(perfect_storm), perfect_storm_pct), unsafe_allow_html=True)
+        st.markdown(RISK_PROFILE_HTML.substitute(
+            count=f"{stats['perfect_storm']:,}",
+            pct=f"{stats['perfect_storm_pct']:.1f}"
+        ), unsafe_allow_html=True)
     
     with col2:
-        st.markdown("""
-        <div class="insight-box">
-        <h3>Meet Sarah: The Commuter</h3>
-        <p><strong>38-year-old marketing manager | Birmingham</strong></p>
-        <h4 style="color: #333;">Daily Routine:</h4>
-        <table style="width: 100%; border-collapse: collapse; color: #333;">
-            <tr style="border-bottom: 1px solid #ddd;">
-                <td style="padding: 8px; width: 30%; color: #333;"><strong>7:30 AM</strong></td>
-                <td style="padding: 8px; color: #333;">Leaves home (rural area)</td>
-            </tr>
-            <tr style="border-bottom: 1px solid #ddd;">
-                <td style="padding: 8px; color: #333;"><strong>7:45 AM</strong></td>
-                <td style="padding: 8px; color: #333;">Rural roads (poor lighting, high speeds)</td>
-            </tr>
-            <tr style="border-bottom: 1px solid #ddd;">
-                <td style="padding: 8px; color: #333;"><strong>8:15 AM</strong></td>
-                <td style="padding: 8px; color: #333;">Motorway (congestion, stress)</td>
-            </tr>
-            <tr style="border-bottom: 1px solid #ddd;">
-                <td style="padding: 8px; color: #333;"><strong>8:45 AM</strong></td>
-                <td style="padding: 8px; color: #333;">Urban streets (complex junctions)</td>
-            </tr>
-            <tr>
-                <td style="padding: 8px; color: #333;"><strong>9:00 AM</strong></td>
-                <td style="padding: 8px; color: #333;">Arrives at office</td>
-            </tr>
-        </table>
-        <p style="margin-top: 15px; padding: 10px; background-color: #fff3cd; border-left: 4px solid #ffc107; color: #333;">
-        <strong>Sarah faces:</strong> 4 junction crossings, 2 T-junctions, rush hour traffic daily.<br>
-        She represents <strong>millions of UK commuters</strong> at maximum risk.
-        </p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(COMMUTER_STORY_HTML, unsafe_allow_html=True)
     
     
     st.markdown("---")
@@ -1241,49 +749,13 @@ elif page == "Comprehensive Analysis":
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.markdown("""
-        <div class="insight-box">
-        <h3>Immediate (0-6 months)</h3>
-        <p><strong>Quick Wins - Low Cost, High Impact</strong></p>
-        <ul>
-            <li><strong>Flexible Work Hours:</strong> Partner with 1000+ employers to stagger start times</li>
-            <li><strong>Junction Signage:</strong> Install high-contrast signs at 500 dangerous T-junctions</li>
-            <li><strong>Speed Reduction:</strong> Lower limits near 200 high-risk junctions</li>
-            <li><strong>Public Campaign:</strong> Target middle-aged commuters via radio/digital ads</li>
-        </ul>
-        <p><strong>Cost:</strong> £50M | <strong>Expected Impact:</strong> 10-15% reduction</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(IMMEDIATE_ACTIONS_HTML, unsafe_allow_html=True)
     
     with col2:
-        st.markdown("""
-        <div class="insight-box">
-        <h3>Medium-Term (6-18 months)</h3>
-        <p><strong>Infrastructure & Technology</strong></p>
-        <ul>
-            <li><strong>Smart Traffic Lights:</strong> AI-powered systems at 100 urban junctions</li>
-            <li><strong>Roundabout Conversions:</strong> Replace 50 dangerous T-junctions</li>
-            <li><strong>Public Transport:</strong> Expand capacity by 30% on commuter routes</li>
-            <li><strong>Junction Upgrades:</strong> Add turning lanes, improve visibility</li>
-        </ul>
-        <p><strong>Cost:</strong> £300M | <strong>Expected Impact:</strong> 25-30% reduction</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(MEDIUM_TERM_ACTIONS_HTML, unsafe_allow_html=True)
     
     with col3:
-        st.markdown("""
-        <div class="insight-box">
-        <h3>Long-Term (18+ months)</h3>
-        <p><strong>Systemic Transformation</strong></p>
-        <ul>
-            <li><strong>Urban Redesign:</strong> Mixed-use development to reduce commute distance</li>
-            <li><strong>Remote Work:</strong> National infrastructure for 50% remote capability</li>
-            <li><strong>Junction Elimination:</strong> Grade-separated crossings at major routes</li>
-            <li><strong>Behavioral Change:</strong> Mandatory defensive driving for 40+ drivers</li>
-        </ul>
-        <p><strong>Cost:</strong> £1B+ | <strong>Expected Impact:</strong> 40-50% reduction</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(LONG_TERM_ACTIONS_HTML, unsafe_allow_html=True)
     
     st.markdown("---")
     
@@ -1348,6 +820,476 @@ elif page == "Comprehensive Analysis":
         - Use alternative transport
         """)
 
+# Check if files exist, otherwise show uploader
+if not os.path.exists('UK_Accidents_Fully_Cleaned.parquet') or not os.path.exists('UK_Vehicles_Fully_Cleaned.parquet'):
+    st.title("📁 Upload Data Files")
+    st.info("Please upload both UK_Accidents_Fully_Cleaned.parquet and UK_Vehicles_Fully_Cleaned.parquet files to continue.")
+    
+    accidents_file = st.file_uploader("Upload Accidents Parquet File", type=['parquet'], key='accidents')
+    vehicles_file = st.file_uploader("Upload Vehicles Parquet File", type=['parquet'], key='vehicles')
+    
+    if accidents_file is not None and vehicles_file is not None:
+        with open('UK_Accidents_Fully_Cleaned.parquet', 'wb') as f:
+            f.write(accidents_file.getvalue())
+        with open('UK_Vehicles_Fully_Cleaned.parquet', 'wb') as f:
+            f.write(vehicles_file.getvalue())
+        st.success("Files uploaded successfully! Reloading...")
+        st.rerun()
+    else:
+        st.stop()
+
+# Sidebar
+st.sidebar.title("Dashboard Navigation")
+st.sidebar.markdown("---")
+
+page = st.sidebar.radio(
+    "Select Analysis View:",
+    ["Introduction", 
+     "Office Hours Impact", 
+     "Age Group Analysis",
+     "Geographic Patterns",
+     "Junction Safety Analysis",
+     "Comprehensive Analysis"]
+)
+
+st.sidebar.markdown("---")
+st.sidebar.markdown("### Dataset Info")
+# Dataset-wide figures come from the cached summary, so the sidebar doesn't need the full frame
+summary = page_aggregate('dataset_summary')
+st.sidebar.metric("Total Accidents", f"{summary['rows']:,}")
+st.sidebar.metric("Date Range", f"{summary['first_year']} - {summary['last_year']}")
+st.sidebar.metric("Total Casualties", f"{summary['casualties']:,}")
+
+# Main content
+st.markdown('<p class="main-header">UK Road Accidents Analysis Dashboard</p>', unsafe_allow_html=True)
+st.markdown("### Understanding Patterns: Office Hours, Middle-Aged Drivers & Geographic Factors")
+st.markdown("---")
+
+# ==================== PAGE 1: INTRODUCTION ====================
+if page == "Introduction":
+    st.markdown("## Welcome to the UK Road Accidents Analysis Dashboard")
+    
+    st.markdown("""
+    This comprehensive dashboard explores **UK road accidents data (2005-2023)** to uncover critical patterns 
+    and provide actionable insights for reducing accidents and saving lives.
+    
+    ### About This Analysis
+    
+    We analyzed over **2 million accident records** to understand the key factors contributing to road accidents 
+    in the United Kingdom. Our investigation focused on four critical dimensions:
+    """)
+    
+    # Four key insights overview
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("""
+        <div class="insight-box">
+        <h3>1️⃣ Office Hours & Commuting Patterns</h3>
+        <p>Investigating the relationship between work schedules and accident rates</p>
+        <ul>
+            <li>When do most accidents occur?</li>
+            <li>Are weekdays more dangerous than weekends?</li>
+            <li>What role does rush hour play?</li>
+        </ul>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown("""
+        <div class="insight-box">
+        <h3>2️⃣ Age Group Analysis</h3>
+        <p>Understanding which age groups are most vulnerable on the roads</p>
+        <ul>
+            <li>Which age groups have the highest accident involvement?</li>
+            <li>Why are middle-aged drivers a focal point?</li>
+            <li>What factors contribute to their risk?</li>
+        </ul>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown("""
+        <div class="insight-box">
+        <h3>3️⃣ Geographic Patterns</h3>
+        <p>Analyzing the spatial distribution of accidents across urban and rural areas</p>
+        <ul>
+            <li>Where are accident hotspots located?</li>
+            <li>How do urban and rural patterns differ?</li>
+            <li>Which local authorities need immediate attention?</li>
+        </ul>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown("""
+        <div class="insight-box">
+        <h3>4️⃣ Junction Safety Analysis</h3>
+        <p>Examining the role of junction infrastructure in accident occurrence</p>
+        <ul>
+            <li>What percentage of accidents occur at junctions?</li>
+            <li>Which junction types are most dangerous?</li>
+            <li>How can infrastructure improvements reduce accidents?</li>
+        </ul>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    # Dataset overview
+    st.markdown("###  Dataset Overview")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Total Accidents", f"{summary['rows']:,}")
+    
+    with col2:
+        st.metric("Total Casualties", f"{summary['casualties']:,}")
+    
+    with col3:
+        st.metric("Date Range", f"{summary['first_year']}-{summary['last_year']}")
+    
+    with col4:
+        st.metric("Fatal Accidents", f"{summary['fatal']:,}")
+    
+    st.markdown("---")
+    
+    # How to use this dashboard
+    st.markdown("###  How to Navigate This Dashboard")
+    
+    st.markdown("""
+    Use the **sidebar** to explore each dimension of our analysis:
+    
+    1. **Office Hours Impact**: Discover when accidents peak and why commuting matters
+    2. **Age Group Analysis**: Learn about the demographics of accident involvement
+    3. **Geographic Patterns**: Explore accident hotspots across the UK
+    4. **Junction Safety Analysis**: Understand junction-related accidents and solutions
+    5. **Comprehensive Analysis**: See how all insights connect to form the complete picture
+    
+    Each page provides:
+    -  Interactive visualizations
+    -  Data-driven insights
+    -  Actionable recommendations
+    """)
+    
+    st.markdown("---")
+    
+    st.info(""" 
+    **Ready to begin?** Select any section from the sidebar to start exploring the data. 
+    We recommend starting with **Office Hours Impact** to understand temporal patterns, 
+    then moving through the other sections to build a complete understanding.
+    """)
+
+# ==================== PAGE 2: OFFICE HOURS IMPACT ====================
+elif page == "Office Hours Impact":
+    st.markdown("## Office Hours & Commuting Patterns")
+    
+    st.markdown("""
+    ### The Question: When are roads most dangerous?
+    Our hypothesis: **Peak accident times align with office commuting hours**, suggesting that work-related travel 
+    is a major risk factor.
+    """)
+    
+    # Hour of Day Analysis
+    st.markdown("###  Hourly Accident Distribution")
+    
+    st.plotly_chart(hourly_figure(page_aggregate('hourly_counts')), use_container_width=True)
+    
+    # Heatmap
+    st.markdown("### Hour vs Day of Week Heatmap")
+    
+    st.plotly_chart(hour_day_heatmap(page_aggregate('hour_day_counts')), use_container_width=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("### Weekday vs Weekend")
+        day_type_counts = page_aggregate('day_type_counts')
+        
+        fig = go.Figure(data=[go.Pie(
+            labels=day_type_counts.index,
+            values=day_type_counts.values,
+            hole=.4,
+            marker_colors=['#ff6b6b', '#4ecdc4']
+        )])
+        fig.update_layout(title="Weekdays Dominate Accident Statistics", height=400)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.markdown("### Time Period Distribution")
+        period_counts = page_aggregate('time_period_counts')
+        
+        fig = px.bar(
+            x=period_counts.index,
+            y=period_counts.values,
+            color=period_counts.values,
+            color_continuous_scale='Reds'
+        )
+        fig.update_layout(
+            title="Daytime (Work Hours) Has Most Accidents",
+            xaxis_title="Time Period",
+            yaxis_title="Number of Accidents",
+            showlegend=False,
+            height=400
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Skip sunburst chart - causes categorical error
+    
+    # Actionable Insights
+    st.markdown("---")
+    st.markdown("## Actionable Recommendations")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("""
+        ### For Employers:
+        - Implement **flexible work hours** (7-10 AM start times)
+        - Offer **work-from-home** options 2-3 days/week
+        - Provide **subsidized public transport** passes
+        - Create **carpool matching programs**
+        - Avoid scheduling early morning meetings
+        """)
+    
+    with col2:
+        st.markdown("""
+        ### For Policy Makers:
+        - Increase **traffic police presence** during rush hours
+        - Implement **smart traffic management** systems
+        - Create **dedicated bus/HOV lanes**
+        - Launch **"Safe Commute" awareness campaigns**
+        - Consider **congestion pricing** during peak hours
+        """)
+
+# ==================== PAGE 3: AGE GROUP ANALYSIS ====================
+elif page == "Age Group Analysis":
+    st.markdown("## Middle-Aged Drivers: The Hidden Risk Group")
+    
+    st.markdown("""
+    ### The Question: Which age group is most vulnerable?
+    Conventional wisdom suggests young drivers are most at risk. Our data tells a different story...
+    """)
+    
+    # Age distribution
+    age_counts = page_aggregate('age_band_counts')
+    
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=age_counts.index,
+        y=age_counts.values,
+        marker_color=['red' if '26' in str(x) or '36' in str(x) or '46' in str(x) else 'steelblue' for x in age_counts.index],
+        texttemplate='%{y:.3s}',
+        textposition='outside'
+    ))
+    
+    fig.update_layout(
+        title="Age Band Distribution: Middle-Aged Drivers Dominate",
+        xaxis_title="Driver Age Band",
+        yaxis_title="Number of Accidents",
+        height=500,
+        xaxis_tickangle=-45
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Journey Purpose
+    st.markdown("### Journey Purpose Analysis")
+    journey_purpose = page_aggregate('journey_purpose_counts')
+    
+    fig = px.bar(
+        x=journey_purpose.values,
+        y=journey_purpose.index,
+        orientation='h',
+        title='Top 10 Journey Purposes During Accidents',
+        labels={'x': 'Number of Accidents', 'y': 'Journey Purpose'},
+        color=journey_purpose.values,
+        color_continuous_scale='Sunset'
+    )
+    fig.update_layout(showlegend=False, height=500)
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Insights
+    st.markdown("---")
+    st.markdown("## Why Middle-Aged Drivers?")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown("""
+        ### Exposure Factor
+        - Highest employment rate
+        - Daily commuting
+        - More time on roads
+        - Work-related travel
+        """)
+    
+    with col2:
+        st.markdown("""
+        ### Stress & Fatigue
+        - Work pressure
+        - Family responsibilities
+        - Long commutes
+        - Multitasking tendency
+        """)
+    
+    with col3:
+        st.markdown("""
+        ### Solutions
+        - Workplace wellness programs
+        - Flexible schedules
+        - Defensive driving courses
+        - Health screenings (40+)
+        """)
+
+# ==================== PAGE 4: GEOGRAPHIC PATTERNS ====================
+elif page == "Geographic Patterns":
+    st.markdown("## Geographic Patterns: Urban vs Rural Dynamics")
+    
+    st.markdown("""
+    ### The Question: Where are accidents concentrated?
+    Understanding geographic patterns helps us allocate resources and design targeted interventions.
+    """)
+    
+    # Summary statistics
+    col1, col2, col3 = st.columns(3)
+    
+    # Area totals and fatal counts all come from one area x severity table
+    area_severity = page_aggregate('area_severity_counts')
+    urban_total = area_severity.loc['Urban'].sum()
+    rural_total = area_severity.loc['Rural'].sum()
+    total = urban_total + rural_total
+    
+    with col1:
+        st.metric("Urban Accidents", f"{urban_total:,}", f"{urban_total/total*100:.1f}%")
+    
+    with col2:
+        st.metric("Rural Accidents", f"{rural_total:,}", f"{rural_total/total*100:.1f}%")
+    
+    with col3:
+        urban_fatal = area_severity.loc['Urban', 'Fatal']
+        rural_fatal = area_severity.loc['Rural', 'Fatal']
+        st.metric("Rural Fatal Rate", f"{rural_fatal/rural_total*100:.2f}%", 
+                 f"vs Urban: {urban_fatal/urban_total*100:.2f}%")
+    
+    # Density Heatmap
+    st.markdown("### UK Road Accidents Density Heatmap")
+    
+    # Load pre-generated map to avoid runtime plotting
+    map_file = 'maps/density_heatmap.html'
+    if os.path.exists(map_file):
+        with open(map_file, 'r', encoding='utf-8') as f:
+            html_content = f.read()
+        st.components.v1.html(html_content, height=700, scrolling=True)
+    else:
+        st.warning("Map not found. Please run generate_maps.py first to create static maps.")
+    
+    # Urban vs Rural Map
+    st.markdown("### Urban vs Rural: Local Authority Classification")
+    
+    # Load pre-generated map to avoid runtime plotting
+    map_file = 'maps/urban_vs_rural_map.html'
+    if os.path.exists(map_file):
+        with open(map_file, 'r', encoding='utf-8') as f:
+            html_content = f.read()
+        st.components.v1.html(html_content, height=800, scrolling=True)
+    else:
+        st.warning("Map not found. Please run generate_maps.py first to create static maps.")
+    
+    # Detailed comparison - Load 4 separate pre-generated charts
+    st.markdown("### Urban vs Rural Detailed Comparison")
+    
+    # Create 2x2 grid
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Chart 1: Accident Count
+        chart1_path = os.path.join('maps', 'urban_rural_chart1_count.html')
+        if os.path.exists(chart1_path):
+            with open(chart1_path, 'r', encoding='utf-8') as f:
+                html_content = f.read()
+            st.components.v1.html(html_content, height=450, scrolling=False)
+        else:
+            st.warning("⚠️ Chart 1 not found. Run 'python generate_maps.py'")
+    
+    with col2:
+        # Chart 2: Urban Severity
+        chart2_path = os.path.join('maps', 'urban_rural_chart2_urban_severity.html')
+        if os.path.exists(chart2_path):
+            with open(chart2_path, 'r', encoding='utf-8') as f:
+                html_content = f.read()
+            st.components.v1.html(html_content, height=450, scrolling=False)
+        else:
+            st.warning("⚠️ Chart 2 not found. Run 'python generate_maps.py'")
+    
+    col3, col4 = st.columns(2)
+    
+    with col3:
+        # Chart 3: Rural Severity
+        chart3_path = os.path.join('maps', 'urban_rural_chart3_rural_severity.html')
+        if os.path.exists(chart3_path):
+            with open(chart3_path, 'r', encoding='utf-8') as f:
+                html_content = f.read()
+            st.components.v1.html(html_content, height=450, scrolling=False)
+        else:
+            st.warning("⚠️ Chart 3 not found. Run 'python generate_maps.py'")
+    
+    with col4:
+        # Chart 4: Casualties Comparison
+        chart4_path = os.path.join('maps', 'urban_rural_chart4_casualties.html')
+        if os.path.exists(chart4_path):
+            with open(chart4_path, 'r', encoding='utf-8') as f:
+                html_content = f.read()
+            st.components.v1.html(html_content, height=450, scrolling=False)
+        else:
+            st.warning("⚠️ Chart 4 not found. Run 'python generate_maps.py'")
+    
+    # Top dangerous areas
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("### Top 10 Urban Hotspots")
+        st.dataframe(top_authorities('Urban'), use_container_width=True)
+    
+    with col2:
+        st.markdown("### Top 10 Rural Hotspots")
+        st.dataframe(top_authorities('Rural'), use_container_width=True)
+    
+    # Recommendations
+    st.markdown("---")
+    st.markdown("## Targeted Interventions")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("""
+        ### Urban Areas Strategy:
+        - **Smart traffic management** systems
+        - **More roundabouts** at high-risk junctions
+        - **Expanded public transport** networks
+        - **Congestion pricing** during peak hours
+        - **Automated enforcement** (cameras)
+        - **Reduced parking** in city centers
+        """)
+    
+    with col2:
+        st.markdown("""
+        ### Rural Areas Strategy:
+        - **Variable speed limits** based on conditions
+        - **Safety barriers** on dangerous curves
+        - **Improved road markings** and signage
+        - **Better street lighting** near villages
+        - **Wildlife warning systems**
+        - **Faster emergency response** positioning
+        """)
+
+# ==================== PAGE 5: JUNCTION SAFETY ANALYSIS ====================
+elif page == "Junction Safety Analysis":
+    render_junction()
+
+# ==================== PAGE 6: COMPREHENSIVE ANALYSIS ====================
+elif page == "Comprehensive Analysis":
+    render_comprehensive()
+
 # Footer
 st.markdown("---")
 st.markdown("""